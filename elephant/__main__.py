@@ -1,24 +1,77 @@
 """Entry point for the Elephant service."""
 
-import argparse
-import uvicorn
+import sys
+from typing import Any, Optional, Sequence
+
+USAGE = """usage: python -m elephant [-h] [--debug] [--host HOST] [--port PORT]
+
+Elephant Carbon Grid Intensity Service
+
+options:
+  -h, --help   show this help message and exit
+  --debug      Enable debug mode
+  --host HOST  Host to bind to (default: 0.0.0.0)
+  --port PORT  Port to bind to (default: 8085)
+"""
+
+
+def _usage_error(message: str) -> None:
+    """Print an argparse style error and exit with status 2."""
+    sys.stderr.write(USAGE.split("\n", 1)[0] + "\n")
+    sys.stderr.write(f"python -m elephant: error: {message}\n")
+    sys.exit(2)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    """Parse the command line.
+
+    The grammar is three flags, so a plain scan over argv is enough and avoids building an argparse parser on
+    every start of the service.
+    """
+    args: dict[str, Any] = {"debug": False, "host": "0.0.0.0", "port": 8085}
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    while argv:
+        arg = argv.pop(0)
+        name, has_value, value = arg.partition("=")
+
+        if arg in ("-h", "--help"):
+            sys.stdout.write(USAGE)
+            sys.exit(0)
+        elif arg == "--debug":
+            args["debug"] = True
+        elif name in ("--host", "--port"):
+            if not has_value:
+                if not argv or argv[0].startswith("-"):
+                    _usage_error(f"argument {name}: expected one argument")
+                value = argv.pop(0)
+
+            if name == "--port":
+                try:
+                    args["port"] = int(value)
+                except ValueError:
+                    _usage_error(f"argument --port: invalid int value: '{value}'")
+            else:
+                args["host"] = value
+        else:
+            _usage_error(f"unrecognized arguments: {arg}")
+
+    return args
 
 
 def main() -> None:
     """Run the Elephant service."""
-    parser = argparse.ArgumentParser(description="Elephant Carbon Grid Intensity Service")
-    parser.add_argument("--debug", action="store_true", help="Enable debug mode")
-    parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
-    parser.add_argument("--port", type=int, default=8085, help="Port to bind to")
+    args = parse_args()
 
-    args = parser.parse_args()
+    # Imported after parsing so `--help` and argument errors return without loading the server stack.
+    import uvicorn  # pylint: disable=import-outside-toplevel
 
     uvicorn.run(
         "elephant.app:app",
-        host=args.host,
-        port=args.port,
-        reload=args.debug,
-        log_level="debug" if args.debug else "info",
+        host=args["host"],
+        port=args["port"],
+        reload=args["debug"],
+        log_level="debug" if args["debug"] else "info",
     )
 
 
@@ -1,39 +1,109 @@
 """Main FastAPI application for Elephant service."""
 
-import inspect
+import asyncio
 import logging
 import re
+import time
 from contextlib import asynccontextmanager
-from pathlib import Path
-from typing import Annotated, Optional, Any, AsyncGenerator, Dict, List
+from functools import lru_cache
+from importlib.resources import files
+from typing import Annotated, Optional, Any, AsyncGenerator, Callable, Dict, List
 from datetime import datetime, timedelta, timezone
 
-from fastapi import FastAPI, HTTPException, Query, Depends, Header
+from fastapi import FastAPI, HTTPException, Query, Depends, Header, Response
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from psycopg import Connection
 from pydantic import BaseModel, Field, field_validator
 
 from elephant.config import Config, config as app_config
-from elephant.database import connection_dependency, fetch_between, fetch_latest, fetch_regions
-from elephant.cron import run_cron
-from elephant.providers.helpers import get_providers
+from elephant.database import (
+    carbon_row,
+    close_connection_pool,
+    connection_dependency,
+    connection_pool,
+    fetch_between,
+    fetch_latest,
+    fetch_regions,
+)
 from elephant.simulation import (
+    SimulationConflictError,
     SimulationExhaustedError,
     SimulationNotFoundError,
     SimulationValueInput,
     simulation_store,
 )
+from elephant.timeutils import fromisoformat
 
 logger = logging.getLogger(__name__)
-INDEX_HTML = (Path(__file__).resolve().parent / "templates" / "index.html").read_text(encoding="utf-8")
+# Kept as bytes so the dashboard is not re-encoded on every request. We still build a fresh response per request
+# because middlewares (e.g. CORS) append to the headers of the response they are handed.
+INDEX_BYTES = (files(__package__) / "templates" / "index.html").read_bytes()
 
 # Global configuration and providers
 config: Config = app_config
+LOG_LEVEL = getattr(logging, config.logging.level.upper(), logging.INFO)
+
+_UTC = timezone.utc
+_ZERO_OFFSET = timedelta(0)
 
 EMISSION_FACTOR_TYPE = "lifecycle"
 TEMPORAL_GRANULARITY = "notimplemented"  # Placeholder until we support variable granularities
+HEALTH_CACHE_SECONDS = 30
+# How long the readiness probe waits for a database connection before reporting the service as not ready
+READY_TIMEOUT_SECONDS = 2
+MIN_UPDATE_SECONDS = 60  # Requested updates within this window of a finished one are served from the DB
+LATEST_CACHE_SECONDS = 60
+REGIONS_CACHE_SECONDS = 300
+RESPONSE_CACHE_SIZE = 1024
+REGION_CACHE_SIZE = 256
+
+_REGION_RE = re.compile(r"[A-Za-z]{2}[A-Za-z0-9-]*")
+
+# Updates that are queued or running, and the monotonic time the last ones finished, keyed by (region, provider)
+_pending_updates: dict[tuple[str, Optional[str]], asyncio.Future] = {}
+_last_updates: dict[tuple[str, Optional[str]], float] = {}
+
+# (expiry as monotonic time, value) of cached DB reads, keyed by ("latest", region, provider) or ("regions",)
+_response_cache: dict[tuple, tuple[float, Any]] = {}
+
+# (monotonic time, record count, regions) of the last successful health check DB query
+_health_cache: dict[str, tuple[float, int, list[str]]] = {}
+
+
+# Lookups derived from `config.cron.sources`. They are built once and only rebuilt when `config` is replaced.
+_source_lookups: dict[str, Any] = {}
+
+
+def _get_source_lookups() -> tuple[dict[str, str], list[tuple[str, str, str]]]:
+    """Return the primary provider per region and the provider listing for the current configuration."""
+
+    if _source_lookups.get("config") is not config:
+        primary_by_region: dict[str, str] = {}
+        providers: list[tuple[str, str, str]] = []
+
+        for source in config.cron.sources:
+            provider = source.provider.lower()
+            region_upper = source.region.upper()
+            providers.append((provider, region_upper, source.db_name))
+
+            if not source.primary:
+                continue
+
+            if region_upper in primary_by_region:
+                logger.warning(
+                    "Multiple primary providers configured for %s; using '%s'",
+                    region_upper,
+                    primary_by_region[region_upper],
+                )
+                continue
+
+            primary_by_region[region_upper] = source.db_name
+
+        _source_lookups.update(config=config, primary_by_region=primary_by_region, providers=providers)
+
+    return _source_lookups["primary_by_region"], _source_lookups["providers"]
 
 
 def _get_primary_source(region: str) -> str:
@@ -42,31 +112,32 @@ def _get_primary_source(region: str) -> str:
     if not config:
         raise HTTPException(status_code=500, detail="Configuration not loaded")
 
+    primary_by_region, _ = _get_source_lookups()
     region_upper = region.upper()
 
-    primary_sources = [
-        source.provider
-        for source in config.cron.sources
-        if source.region.upper() == region_upper and getattr(source, "primary", False)
-    ]
-
-    if not primary_sources:
-        raise HTTPException(status_code=400, detail=f"No primary provider configured for region '{region_upper}'")
-    if len(primary_sources) > 1:
-        logger.warning("Multiple primary providers configured for %s; using '%s'", region_upper, primary_sources[0])
-
-    return f"{primary_sources[0].lower()}_{region.lower()}"
+    try:
+        return primary_by_region[region_upper]
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=400, detail=f"No primary provider configured for region '{region_upper}'"
+        ) from exc
 
 
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
+    cron_worker: Optional[asyncio.Task] = None
     try:
-        # Configure logging
-        log_level = config.logging.level.upper()  # pylint: disable=no-member
-        logging.basicConfig(level=getattr(logging, log_level))
+        logging.basicConfig(level=LOG_LEVEL)
         logger.info("Starting %s", fastapi_app.title)
 
+        _get_source_lookups()
+
+        fastapi_app.state.cron_queue = asyncio.Queue()
+        cron_worker = asyncio.create_task(_cron_worker(fastapi_app.state.cron_queue))
+        # Held while the health stats are refreshed so concurrent probes share one DB query
+        fastapi_app.state.health_lock = asyncio.Lock()
+
         logger.info("Application startup complete")
         yield
 
@@ -75,6 +146,9 @@ async def lifespan(fastapi_app: FastAPI) -> AsyncGenerator[None, None]:
         raise
 
     finally:
+        if cron_worker:
+            cron_worker.cancel()
+        close_connection_pool()
         logger.info("Application shutdown complete")
 
 
@@ -83,6 +157,7 @@ app = FastAPI(
     description="Specialized Carbon Grid Intensity (CGI) service",
     version="0.1",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 if config.cors.allow_origins:
@@ -107,69 +182,165 @@ class SimulationCreateRequest(BaseModel):
     @field_validator("carbon_values")
     @classmethod
     def _validate_uniform_carbon_values(cls, values: List[SimulationValueInput]) -> List[SimulationValueInput]:
-        def _is_pair(entry: SimulationValueInput) -> bool:
-            return isinstance(entry, (list, tuple))
-
         if not values:
             return values
 
-        has_pairs = any(_is_pair(entry) for entry in values)
-        has_scalars = any(not _is_pair(entry) for entry in values)
+        # Single pass: every entry must be of the same kind as the first one
+        pairs = isinstance(values[0], (list, tuple))
 
-        if has_pairs and has_scalars:
-            raise ValueError("carbon_values must be all numbers or all (value, calls) pairs")
-
-        if has_pairs:
-            for entry in values:
-                if len(entry) != 2:
-                    raise ValueError("Each (value, calls) entry must have exactly 2 items")
+        for entry in values:
+            if isinstance(entry, (list, tuple)) is not pairs:
+                raise ValueError("carbon_values must be all numbers or all (value, calls) pairs")
+            if pairs and len(entry) != 2:
+                raise ValueError("Each (value, calls) entry must have exactly 2 items")
 
         return values
 
 
 @app.exception_handler(ValueError)
-async def value_error_handler(_: Any, exc: ValueError) -> JSONResponse:
+async def value_error_handler(_: Any, exc: ValueError) -> ORJSONResponse:
     """Handle configuration validation errors."""
-    return JSONResponse(status_code=400, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=400, content={"detail": str(exc)})
 
 
+@lru_cache(maxsize=REGION_CACHE_SIZE)
 def _normalize_region(region: Optional[str]) -> str:
-    """Validate and normalize a region value."""
+    """Validate and normalize a region value.
+
+    Clients ask for the same handful of regions over and over, so accepted values are memoized. Rejections raise
+    and are therefore never cached.
+    """
     if not region:
         raise HTTPException(status_code=400, detail="region parameter is required")
 
-    if not re.match(r'^[A-Za-z]{2}([A-Za-z0-9-]*)?$', region):
+    if not _REGION_RE.fullmatch(region):
         raise HTTPException(
             status_code=400,
             detail="region must be a valid region code (e.g., 'DE', 'US', 'NO-NO2')",
         )
 
-    return region.upper()
+    return region if region.isupper() else region.upper()
+
+
+async def _run_update(region: str, provider: Optional[str] = None) -> None:
+    """Run the cron for a region, optionally limited to one provider, in the threadpool."""
+    # Imported lazily as the cron pulls in every provider (and requests) which the
+    # read-only endpoints never need.
+    from elephant.cron import run_cron  # pylint: disable=import-outside-toplevel
+
+    if provider is None:
+        logger.info("Updating carbon intensity data for region '%s'...", region)
+        await run_in_threadpool(run_cron, specific_region=region)
+    else:
+        logger.info("Updating carbon intensity data for region '%s' and provider '%s'...", region, provider)
+        await run_in_threadpool(run_cron, specific_region=region, specific_provider=provider)
+
+    _last_updates[(region, provider)] = time.monotonic()
+    _invalidate_cache(region)
+
+
+async def _cached(key: tuple, ttl: float, fetch: Callable[[], Any]) -> Any:
+    """Return the cached value for `key` or run the blocking `fetch` in the threadpool and cache it for `ttl`s."""
+    now = time.monotonic()
+    cached = _response_cache.get(key)
+    if cached and now < cached[0]:
+        return cached[1]
+
+    value = await run_in_threadpool(fetch)
+    if value:
+        if key not in _response_cache and len(_response_cache) >= RESPONSE_CACHE_SIZE:
+            _response_cache.pop(next(iter(_response_cache)))
+        _response_cache[key] = (now + ttl, value)
+
+    return value
+
+
+def _invalidate_cache(region: str) -> None:
+    """Drop cached reads that new data for `region` makes stale."""
+    for key in [key for key in _response_cache if key[0] == "regions" or key[1] == region]:
+        del _response_cache[key]
+
+
+async def _cron_worker(queue: asyncio.Queue) -> None:
+    """Run queued updates one after another so concurrent requests don't each start their own cron run."""
+    while True:
+        key, future = await queue.get()
+        try:
+            await _run_update(*key)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Update of %s failed: %s", key, exc)
+            # Every waiter may have left already (client gone). Fetch the exception once so asyncio
+            # doesn't log "Future exception was never retrieved" for an error we've reported above.
+            future.add_done_callback(lambda done: done.exception())
+            future.set_exception(exc)
+        else:
+            future.set_result(None)
+        finally:
+            _pending_updates.pop(key, None)
+            if not future.done():
+                future.cancel()
+            queue.task_done()
 
 
 async def _handle_update(update: bool|str, region: str) -> None:
-    """Handle update logic for endpoints."""
+    """Handle update logic for endpoints.
+
+    Waits until the requested data has been fetched. Requests for a region/provider that is already queued or
+    running share that run instead of scheduling another one, and ones arriving within MIN_UPDATE_SECONDS of a
+    finished run are skipped.
+    """
+
+    if not update:
+        return
+
+    provider = None
+    if isinstance(update, str) and update.lower() != 'true':
+        provider = update.lower()
+
+    key = (region, provider)
+
+    # A region wide update also covers every provider of that region
+    last_update = max(_last_updates.get(key, 0.0), _last_updates.get((region, None), 0.0))
+    if last_update and time.monotonic() - last_update < MIN_UPDATE_SECONDS:
+        logger.debug("Skipping update for %s as it was updated less than %ss ago", key, MIN_UPDATE_SECONDS)
+        return
+
+    queue: Optional[asyncio.Queue] = getattr(app.state, "cron_queue", None)
+    if queue is None:
+        # No worker without the lifespan (e.g. when endpoints are called directly), so run inline
+        await _run_update(region, provider)
+        return
+
+    future = _pending_updates.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        _pending_updates[key] = future
+        queue.put_nowait((key, future))
+
+    # Shielded so a disconnecting client doesn't cancel the run other requests are waiting on
+    await asyncio.shield(future)
 
-    if update:
-        if update is True or (isinstance(update, str) and update.lower() == 'true'):
-            logger.info("Updating carbon intensity data for region '%s'...", region)
-            await run_in_threadpool(run_cron, specific_region=region)
-        elif isinstance(update, str):
-            logger.info("Updating carbon intensity data for region '%s' and provider '%s'...", region, update)
-            await run_in_threadpool(run_cron, specific_region=region, specific_provider=update)
 
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 request timestamp. Like everything in the API, timestamps without an offset are UTC."""
+    dt = fromisoformat(value)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=_UTC)
 
 
 def _to_iso(dt: datetime) -> str:
     """Return an ISO string with a Z suffix for UTC datetimes."""
+    if dt.utcoffset() == _ZERO_OFFSET:
+        # Common case for rows from the DB (timezone.utc or a session TimeZone like "Etc/UTC"):
+        # no conversion needed, just swap "+00:00" for "Z"
+        return dt.isoformat()[:-6] + "Z"
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+        dt = dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC).isoformat().replace("+00:00", "Z")
 
 
 def _format_em_current(zone: str, carbon_intensity: float, timestamp: datetime | None = None) -> Dict[str, Any]:
     """Format a single carbon intensity record in Electricity Maps style."""
-    ts = _to_iso(timestamp or datetime.now(timezone.utc))
+    ts = _to_iso(timestamp or datetime.now(_UTC))
     return {
         "zone": zone,
         "carbonIntensity": float(carbon_intensity),
@@ -182,11 +353,10 @@ def _format_em_current(zone: str, carbon_intensity: float, timestamp: datetime |
     }
 
 
-def _format_em_history_entry(record: dict) -> Dict[str, Any]:
-    """Format a history entry for Electricity Maps style responses."""
-    ts = _to_iso(record["time"])
+def _format_em_history_entry(carbon_intensity: float, ts: str) -> Dict[str, Any]:
+    """Format a history entry for Electricity Maps style responses from an already formatted `ts`."""
     return {
-        "carbonIntensity": float(record["carbon_intensity"]),
+        "carbonIntensity": float(carbon_intensity),
         "datetime": ts,
         "updatedAt": ts,
         "createdAt": ts,
@@ -216,7 +386,7 @@ async def get_current_carbon_intensity(
     await _handle_update(update, region)
 
     # Query the database for the most recent entry
-    results = fetch_latest(db, region)
+    results = await _cached(("latest", region, None), LATEST_CACHE_SECONDS, lambda: fetch_latest(db, region))
 
     if results:
         return results
@@ -240,20 +410,23 @@ async def get_primary_carbon_intensity(
         return await get_simulation_carbon(simulationId=simulationId, db=db)
 
     region = _normalize_region(region)
-
-    results = await get_current_carbon_intensity(region=region, update=update, db=db)
-
     primary_source = _get_primary_source(region)
 
-    matched = [key for key in results if key.get("provider") == primary_source]
+    await _handle_update(update, region)
 
-    if not matched:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No carbon intensity data available for primary provider '{primary_source}' in this region.",
-        )
+    results = await _cached(
+        ("latest", region, primary_source),
+        LATEST_CACHE_SECONDS,
+        lambda: fetch_latest(db, region, primary_source),
+    )
 
-    return matched
+    if results:
+        return results
+
+    raise HTTPException(
+        status_code=404,
+        detail=f"No carbon intensity data available for primary provider '{primary_source}' in this region.",
+    )
 
 
 @app.get("/carbon-intensity/history")
@@ -282,8 +455,8 @@ async def get_carbon_intensity_history(
 
     # Parse datetime strings
     try:
-        start_dt = datetime.fromisoformat(startTime.replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(endTime.replace("Z", "+00:00"))
+        start_dt = _parse_iso(startTime)
+        end_dt = _parse_iso(endTime)
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -295,7 +468,7 @@ async def get_carbon_intensity_history(
         raise HTTPException(status_code=400, detail="startTime must be before endTime")
 
     # Query the database
-    results = fetch_between(db, region, start_dt, end_dt, provider)
+    results = await run_in_threadpool(fetch_between, db, region, start_dt, end_dt, provider)
 
     return results or []
 
@@ -308,7 +481,7 @@ async def create_simulation(
 ) -> dict:
     """Register a new simulation run with grid intensity values (optionally with per-value call counts)."""
     try:
-        simulationId = simulation_store.create(payload.carbon_values, conn=db)
+        simulationId = await run_in_threadpool(simulation_store.create, payload.carbon_values, conn=db)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -322,9 +495,11 @@ async def get_simulation_carbon(
 ) -> dict:
     """Return the current simulated carbon intensity value (auto-advancing when call thresholds are met)."""
     try:
-        value = simulation_store.current_value(simulationId, conn=db)
+        value = await run_in_threadpool(simulation_store.current_value, simulationId, conn=db)
     except SimulationNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except SimulationConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
 
     return {"simulationId": simulationId, "carbon_intensity": value}
 
@@ -336,7 +511,7 @@ async def advance_simulation(
 ) -> dict:
     """Advance a simulation to its next value."""
     try:
-        value = simulation_store.advance(simulationId, conn=db)
+        value = await run_in_threadpool(simulation_store.advance, simulationId, conn=db)
     except SimulationNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except SimulationExhaustedError as exc:
@@ -352,7 +527,7 @@ async def simulation_stats(
 ) -> dict:
     """Return call history for a simulation."""
     try:
-        return simulation_store.stats(simulationId, conn=db)
+        return await run_in_threadpool(simulation_store.stats, simulationId, conn=db)
     except SimulationNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -373,13 +548,11 @@ async def get_v3_carbon_intensity_current(
         sim_result = await get_simulation_carbon(simulationId=auth_token, db=db)
         return _format_em_current(normalized_zone, sim_result["carbon_intensity"])
 
-    primary_result = get_primary_carbon_intensity(region=normalized_zone, update=False, db=db)
-    primary = await primary_result if inspect.isawaitable(primary_result) else primary_result # We need to do this because of the monkeypatching in tests
+    primary = await get_primary_carbon_intensity(region=normalized_zone, update=False, db=db)
 
-    data = next(iter(primary.values()))
-    timestamp = data.get("time") if isinstance(data, dict) else None
+    data = primary[0]
 
-    return _format_em_current(normalized_zone, data.get("carbon_intensity"), timestamp=timestamp)
+    return _format_em_current(normalized_zone, data["carbon_intensity"], timestamp=data.get("time"))
 
 
 @app.get("/v3/carbon-intensity/history")
@@ -393,21 +566,16 @@ async def get_v3_carbon_intensity_history(
 
     if auth_token:
         sim_result = await get_simulation_carbon(simulationId=auth_token, db=db)
-        now = datetime.now(timezone.utc)
-        history_records = [
-            {
-                "carbon_intensity": sim_result["carbon_intensity"],
-                "time": now,
-            }
-        ]
+        history = [_format_em_history_entry(sim_result["carbon_intensity"], _to_iso(datetime.now(_UTC)))]
     else:
-        end = datetime.now(timezone.utc)
+        end = datetime.now(_UTC)
         start = end - timedelta(hours=24)
-        history_records = fetch_between(db, normalized_zone, start, end)
+        records = await run_in_threadpool(fetch_between, db, normalized_zone, start, end, row_factory=carbon_row)
+        history = [_format_em_history_entry(record.carbon_intensity, _to_iso(record.time)) for record in records]
 
     return {
         "zone": normalized_zone,
-        "history": [_format_em_history_entry(entry) for entry in history_records],
+        "history": history,
         "temporalGranularity": TEMPORAL_GRANULARITY,
     }
 
@@ -419,37 +587,99 @@ async def get_v3_carbon_intensity_history(
 @app.get("/", response_class=HTMLResponse)
 async def index() -> HTMLResponse:
     """Serve a simple dashboard for viewing carbon intensity data."""
-    return HTMLResponse(INDEX_HTML)
+    return HTMLResponse(INDEX_BYTES)
 
 @app.get("/regions")
 async def list_regions(db: Connection = Depends(connection_dependency)) -> list[str]:
     """Return all regions with stored data."""
-    return fetch_regions(db)
+    return await _cached(("regions",), REGIONS_CACHE_SECONDS, lambda: fetch_regions(db))
 
 @app.get("/providers")
 async def list_providers(db: Connection = Depends(connection_dependency)) -> list[tuple[str, str, str]]:
     #!pylint: disable=unused-argument
     """Return all providers with stored data."""
-    return [
-        (source.provider.lower(), source.region.upper(), f"{source.provider.lower()}_{source.region.lower()}")
-        for source in config.cron.sources
-    ]
+    _, providers = _get_source_lookups()
+    return providers
+
+
+def _health_stats() -> tuple[int, list[str]]:
+    """Return the approximate record count and the regions with data.
+
+    Borrows its own pooled connection so `/health` answers from its cache without taking one.
+    """
+    with connection_pool().connection() as db:
+        with db.cursor() as cur:
+            # COUNT(*) scans every chunk of the hypertable. The planner statistics are plenty for a health probe.
+            cur.execute("SELECT approximate_row_count('carbon');")
+            row = cur.fetchone()
+
+        return (row[0] if row else 0), fetch_regions(db)
 
 
 #pylint: disable=broad-exception-caught
 @app.get("/health")
-async def health_check(db: Connection = Depends(connection_dependency)) -> dict:
+async def health_check() -> dict:
     """Health check endpoint."""
+    from elephant.providers.helpers import get_providers  # pylint: disable=import-outside-toplevel
+
     providers = list(get_providers().keys())
 
-    record_count = None
+    now = time.monotonic()
+    cached = _health_cache.get("db")
+
+    if cached is None or now - cached[0] >= HEALTH_CACHE_SECONDS:
+        lock: Optional[asyncio.Lock] = getattr(app.state, "health_lock", None)
+        if lock is None:
+            # Without the lifespan (e.g. the app mounted elsewhere) create it here, inside the running loop
+            lock = app.state.health_lock = asyncio.Lock()
+
+        async with lock:
+            cached = _health_cache.get("db")
+
+            if cached is None or now - cached[0] >= HEALTH_CACHE_SECONDS:
+                try:
+                    cached = (time.monotonic(), *await run_in_threadpool(_health_stats))
+                except Exception as exc:
+                    logger.warning("Health check database count failed: %s", exc)
+                    return {"status": "error", "details": "database query failed"}
+
+                _health_cache["db"] = cached
+
+    _, record_count, regions = cached
+
+    return {
+        "status": "healthy",
+        "providers": providers,
+        "db_records": record_count,
+        "db_records_estimated": True,
+        "regions": regions,
+    }
+
+
+@app.get("/health/live")
+async def health_live() -> dict:
+    """Liveness probe. Does not touch the database so a DB outage doesn't get the service restarted."""
+    return {"status": "ok"}
+
+
+def _ping_database() -> None:
+    """Run a trivial query on a pooled connection, giving up after `READY_TIMEOUT_SECONDS`."""
+    with connection_pool().connection(timeout=READY_TIMEOUT_SECONDS) as conn:
+        conn.execute("SELECT 1;")
+
+
+@app.get("/health/ready")
+async def health_ready(response: Response) -> dict:
+    """Readiness probe. Checks the database on every call and answers 503 when it can't be reached.
+
+    The connection is taken here rather than through `connection_dependency` so a down database turns into a
+    quick 503 instead of the pool's full wait and a 500.
+    """
     try:
-        with db.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM carbon;")
-            row = cur.fetchone()
-            record_count = row[0] if row else 0
+        await run_in_threadpool(_ping_database)
     except Exception as exc:
-        logger.warning("Health check database count failed: %s", exc)
-        return {"status": "error", "details": "database query failed"}
+        logger.warning("Readiness check failed: %s", exc)
+        response.status_code = 503
+        return {"status": "error", "details": "database unreachable"}
 
-    return {"status": "healthy", "providers": providers, "db_records": record_count, "regions": fetch_regions(db)}
+    return {"status": "ready"}
@@ -1,8 +1,9 @@
 """Configuration management for Elephant service."""
 
 import logging
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import yaml
 from pydantic import BaseModel, Field
@@ -11,6 +12,8 @@ from pydantic import BaseModel, Field
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yml"
+# libyaml backed loader when PyYAML was built with it, the pure Python one otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class ProviderConfig(BaseModel):
@@ -37,6 +40,11 @@ class Source(BaseModel):
     only_get_current: bool = False
     primary: bool = False
 
+    @cached_property
+    def db_name(self) -> str:
+        """Key of this source's provider instance, also stored in `carbon.provider` (e.g. 'energycharts_de')."""
+        return f"{self.provider.lower()}_{self.region.lower()}"
+
 
 class CronConfig(BaseModel):
     """Configuration for background polling."""
@@ -82,8 +90,8 @@ def load_config(config_path: Optional[Path] = None) -> Config:
 
     logger.info("Loading configuration from %s", config_path)
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config_data = yaml.safe_load(f)
+    with open(config_path, "rb") as f:
+        config_data = yaml.load(f, Loader=YAML_LOADER)
 
     try:
         return Config(**config_data)
@@ -91,9 +99,20 @@ def load_config(config_path: Optional[Path] = None) -> Config:
         raise ValueError(f"Invalid configuration: {e}") from e
 
 
-try:
-    # Load configuration eagerly so callers can simply import `config`
-    config: Config = load_config()
-except Exception:
-    logger.exception("Failed to load configuration")
-    raise
+if TYPE_CHECKING:
+    config: Config
+
+
+def __getattr__(name: str) -> Any:
+    """Load `config` on first access (PEP 562), so importing the models doesn't require a config file."""
+    if name != "config":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        loaded = load_config()
+    except Exception:
+        logger.exception("Failed to load configuration")
+        raise
+
+    globals()["config"] = loaded
+    return loaded
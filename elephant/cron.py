@@ -6,7 +6,7 @@ from threading import Event
 
 from fastapi import HTTPException
 
-from elephant.database import db_connection
+from elephant.database import close_connection_pool, connection_pool, db_connection
 from elephant.config import config
 from elephant.providers.helpers import get_providers
 from elephant.providers.base import CarbonIntensityProvider
@@ -17,6 +17,9 @@ logger = logging.getLogger(__name__)
 
 shutdown_event = Event()
 
+# Keys every data point returned by a provider must have, no more and no less
+PROVIDER_DATA_KEYS = frozenset({"region", "time", "carbon_intensity", "provider", "resolution", "estimation"})
+
 
 def _request_shutdown(signum, _) -> None:
     """Signal handler to request a graceful shutdown."""
@@ -25,11 +28,8 @@ def _request_shutdown(signum, _) -> None:
 
 
 def wait_with_signal_check(total_seconds: int) -> bool:
-    """Wait in 1s increments, returning True if a shutdown signal arrives."""
-    for _ in range(total_seconds):
-        if shutdown_event.wait(timeout=1):
-            return True
-    return shutdown_event.is_set()
+    """Wait up to `total_seconds`, returning True as soon as a shutdown signal arrives."""
+    return shutdown_event.wait(timeout=total_seconds)
 
 
 def _is_source_due(cur, source_name: str, update_interval_seconds: int | None, force_run: bool = False) -> bool:
@@ -37,7 +37,7 @@ def _is_source_due(cur, source_name: str, update_interval_seconds: int | None, f
     if force_run or not update_interval_seconds:
         return True
 
-    cur.execute("SELECT last_run FROM last_cron_run WHERE source = %s;", (source_name,))
+    cur.execute("SELECT last_run FROM last_cron_run WHERE source = %s;", (source_name,), prepare=True)
     row = cur.fetchone()
     if not row:
         return True
@@ -59,25 +59,108 @@ def _touch_source_run(cur, source_name: str, run_time: datetime) -> None:
         DO UPDATE SET last_run = EXCLUDED.last_run;
         """,
         (source_name, run_time),
+        prepare=True,
     )
 
 
-def run_cron(specific_region=None, specific_provider=None) -> None:
-    """Run a single cron iteration."""
+def _store_data(cur, provider_db_name: str, data: list[dict]) -> tuple[int, int]:
+    """Insert new rows and overwrite changed ones for a provider. Returns (inserted, overwritten) counts.
+
+    The existing values for the whole batch are read with one query and the writes are sent with `executemany`,
+    so a provider response costs a handful of round trips instead of one or two per row.
+    """
+    for d in data:
+        if d.keys() != PROVIDER_DATA_KEYS:
+            raise ValueError(f"Provider '{provider_db_name}' returned data with invalid keys: {set(d.keys())}")
+
+    cur.execute(
+        """
+        SELECT time, region, carbon_intensity::double precision, estimation
+        FROM carbon
+        WHERE provider = %s AND region = ANY(%s) AND time = ANY(%s);
+        """,
+        (provider_db_name, list({d["region"] for d in data}), [d["time"] for d in data]),
+        prepare=True,
+    )
+    existing = {(row[0], row[1]): (row[2], row[3]) for row in cur.fetchall()}
+
+    inserts = []
+    overwrites = []
+    updates = []
+    for d in data:
+        key = (d["time"], d["region"])
+        new = (d["carbon_intensity"], d["estimation"])
+        old = existing.get(key)
+
+        if old is None:
+            inserts.append((d["time"], d["region"], new[0], provider_db_name, new[1]))
+        elif old != new:
+            overwrites.append((d["time"], d["region"], provider_db_name, old[0], new[0], old[1], new[1]))
+            updates.append((new[0], new[1], d["time"], d["region"], provider_db_name))
+
+        # Later duplicates of the same timestamp in this batch compare against what we are about to write
+        existing[key] = new
+
+    if inserts:
+        cur.execute(
+            "INSERT INTO regions (region) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING;",
+            (list({row[1] for row in inserts}),),
+            prepare=True,
+        )
+        cur.executemany(
+            """
+            INSERT INTO carbon (time, region, carbon_intensity, provider, estimation)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (region, provider, time) DO NOTHING;
+            """,
+            inserts,
+        )
+
+    if overwrites:
+        cur.executemany(
+            """
+            INSERT INTO carbon_overwrites
+                (time, region, provider, old_value, new_value, old_estimation, new_estimation)
+            VALUES (%s, %s, %s, %s, %s, %s, %s);
+            """,
+            overwrites,
+        )
+        cur.executemany(
+            """
+            UPDATE carbon
+            SET carbon_intensity = %s, estimation = %s
+            WHERE time = %s AND region = %s AND provider = %s;
+            """,
+            updates,
+        )
+
+    return len(inserts), len(overwrites)
+
+
+def run_cron(specific_region=None, specific_provider=None, pooled=False) -> None:
+    """Run a single cron iteration.
+
+    `pooled` takes the connection from the process wide pool, for the service loop that runs every few seconds.
+    Runs started by the API keep their own connection: the `update=true` requests waiting on them already hold
+    pooled connections, and a run queued behind them could otherwise time out waiting for one.
+    """
     providers: dict[str, CarbonIntensityProvider] = get_providers()
     force_run = specific_region is not None or specific_provider is not None
+    specific_region = specific_region.upper() if specific_region else None
+    specific_provider = specific_provider.lower() if specific_provider else None
 
-    with db_connection() as conn, conn.cursor() as cur:
+    connect = connection_pool().connection if pooled else db_connection
+    with connect() as conn, conn.cursor() as cur:
         for source in config.cron.sources:
             region = source.region.upper()
             provider_name = source.provider.lower()
-            provider_db_name = f"{source.provider.lower()}_{source.region.lower()}"
+            provider_db_name = source.db_name
 
-            if specific_region and specific_region.upper() != region:
+            if specific_region and specific_region != region:
                 logger.debug("Skipping region '%s' as specific_region is set to '%s'.", region, specific_region)
                 continue
 
-            if specific_provider and specific_provider.lower() != provider_name:
+            if specific_provider and specific_provider != provider_name:
                 logger.debug("Skipping provider '%s' as specific_provider is set to '%s'.", provider_name, specific_provider)
                 continue
 
@@ -119,66 +202,7 @@ def run_cron(specific_region=None, specific_provider=None) -> None:
                 conn.commit()
                 continue
 
-            inserted_count = 0
-            overwritten_count = 0
-            for d in data:
-
-                if set(d.keys()) != {"region", "time", "carbon_intensity", "provider", "resolution", "estimation"}:
-                    raise ValueError(f"Provider '{provider_db_name}' returned data with invalid keys: {set(d.keys())}")
-
-                new_value = d.get("carbon_intensity")
-                new_estimation = d["estimation"]
-
-                cur.execute(
-                    """
-                    SELECT carbon_intensity::double precision, estimation
-                    FROM carbon
-                    WHERE time = %s AND region = %s AND provider = %s;
-                    """,
-                    (d["time"], d["region"], provider_db_name),
-                )
-                existing = cur.fetchone()
-
-                if existing is None:
-                    cur.execute(
-                        """
-                        INSERT INTO carbon (time, region, carbon_intensity, provider, estimation)
-                        VALUES (%s, %s, %s, %s, %s);
-                        """,
-                        (d["time"], d["region"], new_value, provider_db_name, new_estimation),
-                    )
-                    inserted_count += 1
-                    continue
-
-                old_value, old_estimation = existing
-                if old_value == new_value and old_estimation == new_estimation:
-                    continue
-
-                cur.execute(
-                    """
-                    INSERT INTO carbon_overwrites
-                        (time, region, provider, old_value, new_value, old_estimation, new_estimation)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s);
-                    """,
-                    (
-                        d["time"],
-                        d["region"],
-                        provider_db_name,
-                        old_value,
-                        new_value,
-                        old_estimation,
-                        new_estimation,
-                    ),
-                )
-                cur.execute(
-                    """
-                    UPDATE carbon
-                    SET carbon_intensity = %s, estimation = %s
-                    WHERE time = %s AND region = %s AND provider = %s;
-                    """,
-                    (new_value, new_estimation, d["time"], d["region"], provider_db_name),
-                )
-                overwritten_count += 1
+            inserted_count, overwritten_count = _store_data(cur, provider_db_name, data)
 
             _touch_source_run(cur, provider_db_name, run_time)
             conn.commit()
@@ -209,6 +233,8 @@ if __name__ == "__main__":
         signal.signal(signal.SIGTERM, _request_shutdown)
 
         while not shutdown_event.is_set():
-            run_cron()
+            run_cron(pooled=True)
             if wait_with_signal_check(config.cron.run_cron_checker_seconds):
                 break
+
+        close_connection_pool()
@@ -1,17 +1,38 @@
 import logging
 import os
 from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Iterator, Generator
+from threading import Lock
+from typing import Any, Iterator, Generator, NamedTuple
 
 import psycopg
 from psycopg import Connection
-from psycopg.rows import dict_row
+from psycopg.rows import RowFactory, RowMaker, dict_row
+from psycopg_pool import ConnectionPool
 
 from elephant.config import config
 
 logger = logging.getLogger(__name__)
 MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+POOL_MAX_SIZE = 10
+POOL_MAX_IDLE_SECONDS = 300
+# Server side limit for API statements so a stuck query can't hold a pooled connection indefinitely
+STATEMENT_TIMEOUT_MS = 60_000
+
+
+class CarbonRow(NamedTuple):
+    """A `carbon` row as selected by `fetch_between`, for callers that don't need to hand out dicts."""
+
+    time: datetime
+    carbon_intensity: float
+    provider: str
+    estimation: bool
+
+
+def carbon_row(_cursor: Any) -> RowMaker[CarbonRow]:
+    """psycopg row factory building `CarbonRow` tuples."""
+    return CarbonRow._make
 
 
 def _database_url() -> str:
@@ -28,10 +49,111 @@ def db_connection() -> Iterator[Connection]:
         conn.close()
 
 
-def connection_dependency() -> Generator[Connection, None, None]:
-    """FastAPI dependency that yields a DB connection."""
-    with db_connection() as conn:
+# The process wide pool under "pool" once opened. The lock makes sure concurrent first requests open only one.
+_pool: dict[str, ConnectionPool] = {}
+_pool_lock = Lock()
+
+
+def connection_pool() -> ConnectionPool:
+    """Return the process wide connection pool, opened on first use."""
+    pool = _pool.get("pool")
+    if pool is None:
+        with _pool_lock:
+            pool = _pool.get("pool")
+            if pool is None:
+                pool = _pool["pool"] = ConnectionPool(
+                    _database_url(),
+                    min_size=1,
+                    max_size=POOL_MAX_SIZE,
+                    max_idle=POOL_MAX_IDLE_SECONDS,
+                    kwargs={"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"},
+                    open=True,
+                )
+
+    return pool
+
+
+def close_connection_pool() -> None:
+    """Close the connection pool if it was ever opened."""
+    with _pool_lock:
+        pool = _pool.pop("pool", None)
+    if pool is not None:
+        pool.close()
+
+
+class LazyConnection:
+    """Stands in for a pooled connection and only checks one out of `pool` when it is first used.
+
+    Attribute access is forwarded to the real connection. The first access blocks while the pool hands one out, so
+    it has to happen in a worker thread like every other DB call of the API.
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self._pool = pool
+        self._borrowed: Any = None
+        self._conn: Connection | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            self._borrowed = self._pool.connection()
+            self._conn = self._borrowed.__enter__()
+        return getattr(self._conn, name)
+
+    @property
+    def checked_out(self) -> bool:
+        """Whether a connection has been taken from the pool."""
+        return self._conn is not None
+
+    def release(self, exc: BaseException | None = None) -> None:
+        """Commit (or roll back if `exc` is given) and return the connection to the pool, if one was taken."""
+        if self._conn is None:
+            return
+
+        borrowed, self._borrowed, self._conn = self._borrowed, None, None
+        borrowed.__exit__(type(exc) if exc else None, exc, exc.__traceback__ if exc else None)
+
+
+def connection_dependency() -> Generator[LazyConnection, None, None]:
+    """FastAPI dependency that yields a pooled DB connection, checked out when the endpoint first uses it.
+
+    Endpoints that wait on an `update=true` cron run or answer from a cache therefore don't hold a pool slot in
+    the meantime. The transaction is committed (or rolled back on error) when the request is done and the
+    connection goes back to the pool, so statements prepared on it are reused by later requests.
+    """
+    conn = LazyConnection(connection_pool())
+    try:
         yield conn
+    except BaseException as exc:
+        conn.release(exc)
+        raise
+    conn.release()
+
+
+# The simulation tables on their own, so tests can create them in a scratch schema without TimescaleDB
+SIMULATION_DDL = """
+CREATE TABLE IF NOT EXISTS simulation_runs (
+  simulation_id     UUID PRIMARY KEY,
+  grid_values       DOUBLE PRECISION[] NOT NULL,
+  current_index     INTEGER NOT NULL DEFAULT 0,
+  version           INTEGER NOT NULL DEFAULT 0,
+  created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS simulation_run_calls (
+  simulation_id     UUID NOT NULL REFERENCES simulation_runs(simulation_id) ON DELETE CASCADE,
+  idx               INTEGER NOT NULL,
+  remaining         INTEGER NOT NULL,
+  PRIMARY KEY (simulation_id, idx)
+);
+
+CREATE TABLE IF NOT EXISTS simulation_calls (
+  id                BIGSERIAL PRIMARY KEY,
+  simulation_id     UUID NOT NULL REFERENCES simulation_runs(simulation_id) ON DELETE CASCADE,
+  called_at         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  carbon_intensity  DOUBLE PRECISION NOT NULL,
+  idx               INTEGER NOT NULL
+);
+"""
 
 
 def init_db() -> None:
@@ -50,32 +172,21 @@ def init_db() -> None:
       timescaledb.segmentby='provider'
     );
 
-    CREATE TABLE IF NOT EXISTS simulation_runs (
-      simulation_id     UUID PRIMARY KEY,
-      grid_values       DOUBLE PRECISION[] NOT NULL,
-      calls             INTEGER[] NULL,
-      current_index     INTEGER NOT NULL DEFAULT 0,
-      created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW()
-    );
-
-    CREATE TABLE IF NOT EXISTS simulation_calls (
-      id                BIGSERIAL PRIMARY KEY,
-      simulation_id     UUID NOT NULL REFERENCES simulation_runs(simulation_id) ON DELETE CASCADE,
-      called_at         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-      carbon_intensity  DOUBLE PRECISION NOT NULL,
-      idx               INTEGER NOT NULL
-    );
-
     CREATE TABLE IF NOT EXISTS last_cron_run (
       source    TEXT PRIMARY KEY,
       last_run  TIMESTAMPTZ NOT NULL
     );
+
+    CREATE TABLE IF NOT EXISTS regions (
+      region  TEXT PRIMARY KEY
+    );
     """
 
     with db_connection() as conn, conn.cursor() as cur:
         logger.info("Initializing TimescaleDB schema at %s ...", conn.info.host)
         cur.execute("CREATE EXTENSION IF NOT EXISTS timescaledb;")
         cur.execute(ddl)
+        cur.execute(SIMULATION_DDL)
         conn.commit()
     run_migrations()
     logger.info("Database ready.")
@@ -119,24 +230,43 @@ def run_migrations() -> None:
         conn.commit()
 
 
-def fetch_latest(conn: Connection, region: str) -> dict[str, dict]:
-    """Return the most recent row for each provider at a region."""
-    with conn.cursor(row_factory=dict_row) as cur:
-        cur.execute(
-            """
-            SELECT DISTINCT ON (provider) provider, time, carbon_intensity::double precision, estimation
-            FROM carbon
-            WHERE region = %s
-            ORDER BY provider, time DESC;
-            """,
-            (region,)
-        )
+def fetch_latest(conn: Connection, region: str, provider: str | None = None) -> list[dict]:
+    """Return the most recent row for each provider at a region, or only for `provider` if given."""
+    with conn.cursor(row_factory=dict_row, binary=True) as cur:
+        if provider:
+            cur.execute(
+                """
+                SELECT provider, time, carbon_intensity::double precision, estimation
+                FROM carbon
+                WHERE region = %s AND provider = %s
+                ORDER BY time DESC
+                LIMIT 1;
+                """,
+                (region, provider.lower()),
+                prepare=True,
+            )
+        else:
+            cur.execute(
+                """
+                SELECT DISTINCT ON (provider) provider, time, carbon_intensity::double precision, estimation
+                FROM carbon
+                WHERE region = %s
+                ORDER BY provider, time DESC;
+                """,
+                (region,),
+                prepare=True,
+            )
 
         return cur.fetchall()
 
 
-def fetch_between(conn: Connection, region: str, start_time, end_time, provider = None) -> list[dict]:
-    """Return rows within the requested window for a region, optionally filtered by provider."""
+def fetch_between(
+    conn: Connection, region: str, start_time, end_time, provider = None, row_factory: RowFactory = dict_row
+) -> list:
+    """Return rows within the requested window for a region, optionally filtered by provider.
+
+    Rows are dicts by default. Pass `row_factory=carbon_row` to get lighter `CarbonRow` tuples instead.
+    """
 
     query = """
         SELECT time, carbon_intensity::double precision, provider, estimation
@@ -153,24 +283,19 @@ def fetch_between(conn: Connection, region: str, start_time, end_time, provider
 
     query += "ORDER BY time;"
 
-    with conn.cursor(row_factory=dict_row) as cur:
-        cur.execute(query, params)
+    with conn.cursor(row_factory=row_factory, binary=True) as cur:
+        cur.execute(query, params, prepare=True)
         return cur.fetchall()
 
 def fetch_regions(conn: Connection) -> list[str]:
-    """Return a list of distinct regions with data."""
-    with conn.cursor(row_factory=dict_row) as cur:
-        cur.execute(
-            """
-            SELECT DISTINCT region
-            FROM carbon
-            WHERE region IS NOT NULL
-            ORDER BY region;
-            """
-        )
-        rows = cur.fetchall()
-    return [row["region"] for row in rows if row.get("region")]
+    """Return a list of distinct regions with data.
 
+    Reads the small `regions` table the cron keeps up to date instead of a DISTINCT over every chunk of `carbon`.
+    """
+    with conn.cursor(binary=True) as cur:
+        cur.execute("SELECT region FROM regions ORDER BY region;", prepare=True)
+        rows = cur.fetchall()
+    return [row[0] for row in rows if row[0]]
 
 if __name__ == "__main__":
     init_db()
@@ -4,6 +4,35 @@ from abc import ABC, abstractmethod
 from typing import List
 from datetime import datetime
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Enough pooled connections per host for the concurrent SMARD fetches
+HTTP_POOL_MAXSIZE = 16
+
+
+def http_session() -> requests.Session:
+    """Return a session that keeps connections to upstream APIs alive and retries transient failures."""
+    adapter = HTTPAdapter(
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        # Anything that can take long would stall the cron and every `update=true` request behind it. So only
+        # failed connects and gateway errors (502-504) are retried with a short backoff: not read timeouts, which
+        # already cost the full request timeout, and not rate limits (429), whose Retry-After can ask for hours.
+        max_retries=Retry(
+            total=3,
+            connect=2,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            respect_retry_after_header=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class CarbonIntensityProvider(ABC):
     """Abstract base class for carbon intensity providers."""
@@ -1,7 +1,14 @@
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from threading import Lock
 from typing import Optional
 
+import orjson
+import requests
+
+from .base import http_session
+
 BASE = "https://www.smard.de/app/chart_data"
 
 # All Numbers from https://www.umweltbundesamt.de/sites/default/files/medien/11850/publikationen/03_2025_cc_emissionsbilanz_erneuerbarer_energien_2023.pdf
@@ -52,15 +59,43 @@ filters = {
 }
 
 LOAD_FILTER = 410
+# Shared by the fetch workers so they reuse keep-alive connections to SMARD
+_SESSION = http_session()
+
+# SMARD files fetched within the last minute, keyed by URL, as (expiry as monotonic time, parsed JSON). This lets
+# the `bundesnetzagentur` and `bundesnetzagentur_all` providers share the files of one cron run, while staying
+# well below the quarter hour in which SMARD publishes new values.
+FETCH_CACHE_SECONDS = 60
+_fetch_cache: dict[str, tuple[float, dict]] = {}
+_fetch_cache_lock = Lock()
+# One worker per series fetched for a timestamp: the load plus every generation filter
+FETCH_WORKERS = len(filters) + 1
+# What one `get_co2intensity` call reads: the index plus one file per series
+FETCH_CACHE_SIZE = FETCH_WORKERS + 1
 
 def fetch_json(url: str) -> Optional[dict]:
+    now = time.monotonic()
+    with _fetch_cache_lock:
+        cached = _fetch_cache.get(url)
+    if cached and now < cached[0]:
+        return cached[1]
+
     try:
-        response = requests.get(url, timeout=30.0)
+        response = _SESSION.get(url, timeout=30.0)
         response.raise_for_status()
-        return response.json()
+        data = orjson.loads(response.content)
     except (requests.RequestException, ValueError):
         return None
 
+    with _fetch_cache_lock:
+        # Entries are in insertion order and share one TTL, so the expired ones, then the oldest, are at the front
+        _fetch_cache.pop(url, None)
+        while _fetch_cache and (len(_fetch_cache) >= FETCH_CACHE_SIZE or next(iter(_fetch_cache.values()))[0] <= now):
+            _fetch_cache.pop(next(iter(_fetch_cache)))
+        _fetch_cache[url] = (now + FETCH_CACHE_SECONDS, data)
+
+    return data
+
 
 def get_latest_timestamp(smard_filter, region= "DE", res= "quarterhour") -> Optional[int]:
 
@@ -81,10 +116,8 @@ def get_series(smard_filter, timestamp, region= "DE", res= "quarterhour") -> Opt
     if not data:
         return None
 
-    load_series = dict(data.get("series"))
-    load_series = {t_ms: val for t_ms, val in load_series.items() if val is not None}
-
-    return load_series
+    # "series" is a list of [timestamp_ms, value] pairs with integer timestamps; build the dict in one pass
+    return {t_ms: val for t_ms, val in data.get("series") or () if val is not None}
 
 
 def get_co2intensity(region: str, resolution: str, scan_all: bool = False) -> Optional[tuple[dict[int, float], dict[int, tuple[float, float]]]]:
@@ -96,59 +129,55 @@ def get_co2intensity(region: str, resolution: str, scan_all: bool = False) -> Op
         return None
 
     if not scan_all:
-        time_stamps = [max(time_stamps)]
+        # SMARD lists the index in ascending order, so the newest file is the last entry
+        time_stamps = [time_stamps[-1]]
 
     ci = {}  # timestamp_ms → gCO2eq/kWh
 
-    for ts in time_stamps:
-        load_series = get_series(LOAD_FILTER, ts, region, resolution)
+    # The load and generation series of a timestamp are independent files, so we request them all at once
+    # and wait for the slowest instead of one after the other.
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        for ts in time_stamps:
+            load_future = executor.submit(get_series, LOAD_FILTER, ts, region, resolution)
+            gen_futures = {f_id: executor.submit(get_series, f_id, ts, region, resolution) for f_id in filters}
 
+            load_series = load_future.result()
 
-        if not load_series:
-            return None
+            if not load_series:
+                return None
 
-        # Build a cache of all the different generation methods with the same timestamp
-        generation_series: dict[str, dict[int, float]] = {}
+            # (series, emission factor) of every generation method SMARD returned data for. Resolved once per
+            # timestamp so the loop below doesn't look up each filter again for every quarter hour.
+            sources: list[tuple[dict[int, float], float]] = []
 
-        for f_id in filters:
-            gen_series = get_series(f_id, ts, region, resolution)
-            if gen_series is None:
-                continue
-
-            generation_series[f_id] = dict(gen_series)
-
-        for t_ms, _ in load_series.items():
-            num = 0.0
-            sum_load = 0.0
+            for f_id, future in gen_futures.items():
+                gen_series = future.result()
+                if gen_series is None:
+                    continue
 
-            abort = False
+                sources.append((gen_series, filters[f_id]))
 
-            for f_id, factor in filters.items():
+            for t_ms in load_series:
+                num = 0.0
+                sum_load = 0.0
 
-                gen_series = generation_series.get(f_id, None)
-                if gen_series is None:
-                    continue
+                abort = False
 
-                gen_mw = gen_series.get(t_ms, None)
-                if gen_mw is None:
-                    gen_series = get_series(f_id, ts, region, resolution)
-                    if gen_series is None:
-                        return None
-                    generation_series[f_id] = gen_series
+                for gen_series, factor in sources:
                     gen_mw = gen_series.get(t_ms, None)
 
-                # Some providers don't update as fast as the main times. In this case we abort and wait for this data to be available
-                if gen_mw is None:
-                    abort = True
-                    break
+                    # Some providers don't update as fast as the main times. In this case we abort and wait for this data to be available
+                    if gen_mw is None:
+                        abort = True
+                        break
 
-                num += gen_mw * factor
-                sum_load += gen_mw
+                    num += gen_mw * factor
+                    sum_load += gen_mw
 
-            if abort:
-                break
+                if abort:
+                    break
 
-            ci[datetime.fromtimestamp(t_ms / 1000, tz=timezone.utc)] = num / sum_load # So we get it in gCO2eq/kWh
+                ci[datetime.fromtimestamp(t_ms / 1000, timezone.utc)] = num / sum_load # So we get it in gCO2eq/kWh
 
     return ci
 
@@ -1,7 +1,9 @@
 """Bundesnetzagentur (SMARD) provider for German grid carbon intensity."""
 
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from operator import itemgetter
 from typing import List
 
 
@@ -29,18 +31,17 @@ class BundesnetzagenturProvider(CarbonIntensityProvider):
         if not data:
             return None
 
-        returnList = []
-        for i,j in data.items():
-            returnList.append({
+        return [
+            {
                 "region": region,
                 "time": i,
                 "carbon_intensity": j,
                 "provider": PROVICER_NAME,
                 "resolution": self.RESOLUTION,
                 "estimation": False,
-            })
-
-        return returnList
+            }
+            for i, j in data.items()
+        ]
 
     def get_historical(self, region: str, start_time: datetime = None, end_time: datetime = None) -> List[dict]:
         """Return historical data, optionally filtered by time bounds."""
@@ -52,19 +53,11 @@ class BundesnetzagenturProvider(CarbonIntensityProvider):
         if start_time is None and end_time is None:
             return data
 
-        filtered: List[dict] = []
-        for entry in data:
-            ts = entry.get("time", None)
-
-            if end_time and ts < end_time:
-                continue
-
-            if end_time and ts > end_time:
-                continue
-
-            filtered.append(entry)
+        # Entries come out of get_co2intensity in ascending time order, so the window is a slice
+        lo = bisect_left(data, start_time, key=itemgetter("time")) if start_time else 0
+        hi = bisect_right(data, end_time, key=itemgetter("time")) if end_time else len(data)
 
-        return filtered
+        return data[lo:hi]
 
     def get_future(self, region: str) -> List[dict]:
         """Get future carbon intensity data for a region."""
@@ -35,18 +35,17 @@ class BundesnetzagenturProvider(CarbonIntensityProvider):
         if not data:
             return None
 
-        returnList = []
-        for i,j in data.items():
-            returnList.append({
+        return [
+            {
                 "region": region,
                 "time": i,
                 "carbon_intensity": j,
                 "provider": PROVIDER_NAME,
                 "resolution": self.RESOLUTION,
                 "estimation": False,
-            })
-
-        return returnList
+            }
+            for i, j in data.items()
+        ]
 
     def get_historical(self, region: str, start_time: datetime = None, end_time: datetime = None) -> List[dict]:
         raise NotImplementedError("Bundesnetzagentur all provider does not support historical data filtering as it takes too long to fetch all data.")
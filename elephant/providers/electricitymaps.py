@@ -4,13 +4,13 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import List
 
-import requests
 from fastapi import HTTPException
 from requests import HTTPError, RequestException, Response
 
 from elephant.config import ProviderConfig
+from elephant.timeutils import fromisoformat
 
-from .base import CarbonIntensityProvider
+from .base import CarbonIntensityProvider, http_session
 
 
 logger = logging.getLogger(__name__)
@@ -29,11 +29,12 @@ class ElectricityMapsProvider(CarbonIntensityProvider):
             raise ValueError("API token is required for ElectricityMapsProvider.")
 
         self.headers = {"auth-token": config.api_token}
+        self._session = http_session()
 
     def _get(self, path: str, params: dict) -> Response:
         """Perform a GET request with shared error handling."""
         try:
-            response = requests.get(f"{BASE_URL}{path}", params=params, timeout=30.0, headers=self.headers)
+            response = self._session.get(f"{BASE_URL}{path}", params=params, timeout=30.0, headers=self.headers)
             response.raise_for_status()
             return response
 
@@ -46,7 +47,7 @@ class ElectricityMapsProvider(CarbonIntensityProvider):
         response = self._get("/v3/carbon-intensity/latest",
                               params={"zone": region, "temporalGranularity": self.resolution})
         data = response.json()
-        item_time = datetime.fromisoformat(data["datetime"].replace("Z", "+00:00"))
+        item_time = fromisoformat(data["datetime"])
         return [
             {
                 "region": region,
@@ -77,20 +78,17 @@ class ElectricityMapsProvider(CarbonIntensityProvider):
 
         history_data = response.json().get("data", [])
 
-        all_data = []
-        for item in history_data:
-            item_time = datetime.fromisoformat(item["datetime"].replace("Z", "+00:00"))
-            all_data.append(
-                {
-                    "region": region,
-                    "time": item_time,
-                    "carbon_intensity": item["carbonIntensity"],
-                    "provider": PROVIDER_NAME,
-                    "resolution": self.resolution,
-                    "estimation": item.get("isEstimated", False),
-                }
-            )
-        return all_data
+        return [
+            {
+                "region": region,
+                "time": fromisoformat(item["datetime"]),
+                "carbon_intensity": item["carbonIntensity"],
+                "provider": PROVIDER_NAME,
+                "resolution": self.resolution,
+                "estimation": item.get("isEstimated", False),
+            }
+            for item in history_data
+        ]
 
     def get_future(self, region: str) -> List[dict]:
 
@@ -102,18 +100,14 @@ class ElectricityMapsProvider(CarbonIntensityProvider):
             },
         )
 
-        all_data = []
-        for item in response.json().get("forecast", []):
-            item_time = datetime.fromisoformat(item["datetime"].replace("Z", "+00:00"))
-            all_data.append(
-                {
-                    "region": region,
-                    "time": item_time,
-                    "carbon_intensity": item["carbonIntensity"],
-                    "provider": PROVIDER_NAME,
-                    "resolution": self.resolution,
-                    "estimation": True,
-                }
-            )
-
-        return all_data
+        return [
+            {
+                "region": region,
+                "time": fromisoformat(item["datetime"]),
+                "carbon_intensity": item["carbonIntensity"],
+                "provider": PROVIDER_NAME,
+                "resolution": self.resolution,
+                "estimation": True,
+            }
+            for item in response.json().get("forecast", [])
+        ]
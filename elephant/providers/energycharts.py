@@ -2,15 +2,16 @@
 
 import logging
 from datetime import datetime, timedelta, timezone
+from itertools import zip_longest
 from typing import List
 
-import requests
+import orjson
 from fastapi import HTTPException
 from requests import HTTPError, RequestException
 
 from elephant.config import ProviderConfig
 
-from .base import CarbonIntensityProvider
+from .base import CarbonIntensityProvider, http_session
 
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__)
 BASE_URL = "https://api.energy-charts.info"
 PROVIDER_NAME = "energycharts"
 RESOLUTION="15_minutes"
+_SESSION = http_session()
 
 class EnergyChartsProvider(CarbonIntensityProvider):
     """Provider for EnergyCharts carbon intensity data."""
@@ -29,10 +31,10 @@ class EnergyChartsProvider(CarbonIntensityProvider):
     def _get(self, region: str) -> dict:
         """Perform a GET request with shared error handling."""
         try:
-            response = requests.get(f"{BASE_URL}/co2eq", params={"country": region.lower()}, timeout=30.0)
+            response = _SESSION.get(f"{BASE_URL}/co2eq", params={"country": region.lower()}, timeout=30.0)
             response.raise_for_status()
-            return response.json()
-        except (HTTPError, RequestException) as exc:
+            return orjson.loads(response.content)
+        except (HTTPError, RequestException, orjson.JSONDecodeError) as exc:
             logger.error("EnergyCharts request error: %s", exc)
             raise HTTPException(status_code=503, detail="EnergyCharts service temporarily unavailable") from exc
 
@@ -43,25 +45,25 @@ class EnergyChartsProvider(CarbonIntensityProvider):
         co2eq_forecast = data.get("co2eq_forecast", [])
 
         entries: List[dict] = []
-        for idx, ts in enumerate(timestamps):
-            value = None
-
-            if idx < len(co2eq) and co2eq[idx] is not None:
-                value = co2eq[idx]
-            elif idx < len(co2eq_forecast) and co2eq_forecast[idx] is not None:
-                value = co2eq_forecast[idx]
-
-            if value is None:
+        utc = timezone.utc
+        # Measured values win over forecasts. zip_longest pads whichever list is shorter with None, zip stops at the
+        # last timestamp.
+        for ts, (measured, forecast) in zip(timestamps, zip_longest(co2eq, co2eq_forecast)):
+            if measured is not None:
+                value, estimation = measured, False
+            elif forecast is not None:
+                value, estimation = forecast, True
+            else:
                 continue
 
             entries.append(
                 {
                     "region": region,
-                    "time": datetime.fromtimestamp(ts, tz=timezone.utc),
+                    "time": datetime.fromtimestamp(ts, utc),
                     "carbon_intensity": value,
                     "provider": PROVIDER_NAME,
                     "resolution": self.resolution,
-                    "estimation": idx >= len(co2eq) or co2eq[idx] is None,
+                    "estimation": estimation,
                 }
             )
 
@@ -1,6 +1,6 @@
 
 import logging
-from typing import Callable
+from typing import Any, Callable
 
 from .base import CarbonIntensityProvider
 from .electricitymaps import ElectricityMapsProvider
@@ -20,15 +20,32 @@ _PROVIDER_FACTORIES: dict[str, Callable[[ProviderConfig], CarbonIntensityProvide
 }
 
 
+# Providers built for the current configuration. They are reused until `config` is replaced.
+_providers_cache: dict[str, Any] = {}
+
+
 def get_providers() -> dict[str, CarbonIntensityProvider]:
-    """Initialize and return the providers referenced by cron sources."""
+    """Return the providers referenced by cron sources, initializing them on first use.
+
+    The service loop and `/health` call this over and over, so the instances (and any HTTP state they keep) are
+    shared rather than rebuilt each time. Callers must not modify the returned dict.
+    """
+    if _providers_cache.get("config") is not config:
+        _providers_cache["providers"] = _build_providers()
+        _providers_cache["config"] = config
+
+    return _providers_cache["providers"]
+
+
+def _build_providers() -> dict[str, CarbonIntensityProvider]:
+    """Initialize the providers referenced by cron sources."""
 
     providers: dict[str, CarbonIntensityProvider] = {}
     seen: set[str] = set()
 
     for source in config.cron.sources:
         provider_name = source.provider.lower()
-        provider_name_reg = f"{source.provider.lower()}_{source.region.lower()}"
+        provider_name_reg = source.db_name
 
         if provider_name_reg in seen:
             continue
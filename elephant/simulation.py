@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Callable, List, Sequence
+from typing import Callable, List
 
 from psycopg import Connection
 from psycopg.rows import dict_row
@@ -18,8 +18,15 @@ class SimulationExhaustedError(IndexError):
     """Raised when attempting to advance beyond available values."""
 
 
+class SimulationConflictError(RuntimeError):
+    """Raised when a simulation kept changing underneath a countdown."""
+
+
 SimulationValueInput = float | tuple[float, int | None]
 
+# How often `current_value` re-reads a run whose version changed between its read and its write
+UPDATE_ATTEMPTS = 5
+
 
 class SimulationStore:
     """Simulation runs persisted in the database."""
@@ -32,16 +39,6 @@ class SimulationStore:
             raise ValueError("Database connection is required")
         return conn
 
-    def _normalize_calls(self, calls: Sequence[int | None] | None, length: int) -> list[int | None]:
-        normalized = [None] * length
-        if calls is None:
-            return normalized
-
-        for idx, value in enumerate(list(calls)[:length]):
-            normalized[idx] = None if value is None else int(value)
-
-        return normalized
-
     def _split_values_and_calls(self, values: List[SimulationValueInput]) -> tuple[list[float], list[int | None]]:
         grid_values: list[float] = []
         call_counts: list[int | None] = []
@@ -60,33 +57,6 @@ class SimulationStore:
 
         return grid_values, call_counts
 
-    def _fetch_run(self, simulation_id: str, conn: Connection, for_update: bool = False) -> dict:
-        """Return grid values, current index, and call configuration for a simulation."""
-        conn = self._require_conn(conn)
-        sql = """
-            SELECT grid_values, current_index, calls
-            FROM simulation_runs
-            WHERE simulation_id = %s
-        """
-        if for_update:
-            sql += " FOR UPDATE"
-
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(sql, (simulation_id,))
-            row = cur.fetchone()
-
-        if not row:
-            raise SimulationNotFoundError(f"Simulation '{simulation_id}' not found")
-
-        values = [float(v) for v in row["grid_values"]]
-        calls = self._normalize_calls(row.get("calls"), len(values))
-
-        return {
-            "values": values,
-            "calls": calls,
-            "current_index": int(row["current_index"]),
-        }
-
     def create(self, values: List[SimulationValueInput], conn: Connection | None = None) -> str:
         """Create a new simulation and return its ID."""
         conn = self._require_conn(conn)
@@ -98,27 +68,26 @@ class SimulationStore:
         grid_values, call_counts = self._split_values_and_calls(values)
         simulation_id = str(uuid.uuid4())
 
-        try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO simulation_runs (simulation_id, grid_values, calls, current_index)
-                    VALUES (%s, %s, %s, %s);
-                    """,
-                    (simulation_id, grid_values, call_counts, 0),
-                )
-                cur.execute(
-                    """
-                    INSERT INTO simulation_calls (simulation_id, called_at, carbon_intensity, idx)
-                    VALUES (%s, %s, %s, %s);
-                    """,
-                    (simulation_id, now, grid_values[0], 0),
+        with conn.transaction(), conn.cursor() as cur:
+            cur.execute(
+                """
+                WITH run AS (
+                    INSERT INTO simulation_runs (simulation_id, grid_values, current_index)
+                    VALUES (%s, %s, 0)
+                    RETURNING simulation_id, grid_values[1] AS carbon_intensity
+                ),
+                limits AS (
+                    INSERT INTO simulation_run_calls (simulation_id, idx, remaining)
+                    SELECT run.simulation_id, counts.idx - 1, counts.remaining
+                    FROM run, unnest(%s::integer[]) WITH ORDINALITY AS counts (remaining, idx)
+                    WHERE counts.remaining IS NOT NULL
                 )
-
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+                INSERT INTO simulation_calls (simulation_id, called_at, carbon_intensity, idx)
+                SELECT simulation_id, %s, carbon_intensity, 0 FROM run;
+                """,
+                (simulation_id, grid_values, call_counts, now),
+                prepare=True,
+            )
 
         return simulation_id
 
@@ -126,94 +95,104 @@ class SimulationStore:
         """Return the current value for a simulation and auto-advance based on call thresholds."""
         conn = self._require_conn(conn)
 
-        try:
-            run = self._fetch_run(simulation_id, conn, for_update=True)
-
-            values = run["values"]
-            calls = list(run["calls"])
-            current_index = run["current_index"]
-
-            if current_index >= len(values):
-                return values[current_index]
-
-            current_value = values[current_index]
-            remaining_calls = calls[current_index]
-
-            should_advance = False
-
-            if remaining_calls is not None and remaining_calls >= 0:
-                new_remaining = remaining_calls - 1
-                calls[current_index] = new_remaining
-
-                if new_remaining <= 0 and (current_index + 1) < len(values):
-                    should_advance = True
-                elif new_remaining <= 0:
-                    calls[current_index] = -1
-
-            new_index = current_index + 1 if should_advance else current_index
-
-            with conn.cursor() as cur:
+        # The countdown runs server side: the current value's row in simulation_run_calls is decremented, the run
+        # moves on once it reaches zero (or is parked at -1 on the last value), and the move is recorded, all in one
+        # statement. Instead of locking the run, the write only applies if `version` is still the one that was read,
+        # so reads of values without a call limit never wait on each other.
+        with conn.transaction(), conn.cursor() as cur:
+            for _ in range(UPDATE_ATTEMPTS):
                 cur.execute(
                     """
-                    UPDATE simulation_runs
-                    SET current_index = %s, calls = %s
-                    WHERE simulation_id = %s;
+                    WITH run AS (
+                        SELECT
+                            r.simulation_id,
+                            r.version,
+                            r.current_index,
+                            r.grid_values[r.current_index + 1] AS carbon_intensity,
+                            c.remaining - 1 AS remaining,
+                            r.current_index + 1 < cardinality(r.grid_values) AS has_next
+                        FROM simulation_runs AS r
+                        LEFT JOIN simulation_run_calls AS c
+                          ON c.simulation_id = r.simulation_id AND c.idx = r.current_index
+                        WHERE r.simulation_id = %s
+                    ),
+                    moved AS (
+                        UPDATE simulation_runs AS r
+                        SET
+                            current_index =
+                                run.current_index + CASE WHEN run.remaining <= 0 AND run.has_next THEN 1 ELSE 0 END,
+                            version = r.version + 1
+                        FROM run
+                        WHERE r.simulation_id = run.simulation_id
+                          AND r.version = run.version
+                          AND run.remaining >= -1
+                        RETURNING
+                            r.simulation_id, r.current_index, r.grid_values[r.current_index + 1] AS carbon_intensity
+                    ),
+                    counted AS (
+                        UPDATE simulation_run_calls AS c
+                        SET remaining = CASE WHEN run.remaining <= 0 AND NOT run.has_next THEN -1 ELSE run.remaining END
+                        FROM run, moved
+                        WHERE c.simulation_id = run.simulation_id AND c.idx = run.current_index
+                    ),
+                    recorded AS (
+                        INSERT INTO simulation_calls (simulation_id, called_at, carbon_intensity, idx)
+                        SELECT moved.simulation_id, %s, moved.carbon_intensity, moved.current_index
+                        FROM moved, run
+                        WHERE moved.current_index <> run.current_index
+                    )
+                    SELECT carbon_intensity, remaining >= -1 AND NOT EXISTS (SELECT 1 FROM moved) AS conflicted
+                    FROM run;
                     """,
-                    (new_index, calls, simulation_id),
+                    (simulation_id, self._time_provider()),
+                    prepare=True,
                 )
+                row = cur.fetchone()
 
-                if should_advance:
-                    next_value = values[new_index]
-                    cur.execute(
-                        """
-                        INSERT INTO simulation_calls (simulation_id, called_at, carbon_intensity, idx)
-                        VALUES (%s, %s, %s, %s);
-                        """,
-                        (simulation_id, self._time_provider(), next_value, new_index),
-                    )
+                if not row:
+                    raise SimulationNotFoundError(f"Simulation '{simulation_id}' not found")
+
+                value, conflicted = row
+                if not conflicted:
+                    return float(value)
 
-            conn.commit()
-            return current_value
-        except Exception:
-            conn.rollback()
-            raise
+        raise SimulationConflictError(f"Simulation '{simulation_id}' is changing too quickly to count down")
 
     def advance(self, simulation_id: str, conn: Connection | None = None) -> float:
         """Advance a simulation to its next value and record the call."""
         conn = self._require_conn(conn)
         now = self._time_provider()
 
-        try:
-            run = self._fetch_run(simulation_id, conn, for_update=True)
-
-            next_index = run["current_index"] + 1
-            if next_index >= len(run["values"]):
-                return run["values"][next_index - 1]
-
-            next_value = run["values"][next_index]
-
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
+        # Only the cells that are returned are read; the bounds check sits in the UPDATE itself, so a concurrent
+        # advance can neither be lost nor push the run past its last value.
+        with conn.transaction(), conn.cursor() as cur:
+            cur.execute(
+                """
+                WITH moved AS (
                     UPDATE simulation_runs
-                    SET current_index = %s, calls = %s
-                    WHERE simulation_id = %s;
-                    """,
-                    (next_index, run["calls"], simulation_id),
-                )
-                cur.execute(
-                    """
+                    SET current_index = current_index + 1, version = version + 1
+                    WHERE simulation_id = %s AND current_index + 1 < cardinality(grid_values)
+                    RETURNING simulation_id, current_index, grid_values[current_index + 1] AS carbon_intensity
+                ),
+                recorded AS (
                     INSERT INTO simulation_calls (simulation_id, called_at, carbon_intensity, idx)
-                    VALUES (%s, %s, %s, %s);
-                    """,
-                    (simulation_id, now, next_value, next_index),
+                    SELECT simulation_id, %s, carbon_intensity, current_index FROM moved
                 )
+                SELECT carbon_intensity FROM moved
+                UNION ALL
+                SELECT grid_values[current_index + 1]
+                FROM simulation_runs
+                WHERE simulation_id = %s AND NOT EXISTS (SELECT 1 FROM moved);
+                """,
+                (simulation_id, now, simulation_id),
+                prepare=True,
+            )
+            row = cur.fetchone()
+
+        if not row:
+            raise SimulationNotFoundError(f"Simulation '{simulation_id}' not found")
 
-            conn.commit()
-            return next_value
-        except Exception:
-            conn.rollback()
-            raise
+        return float(row[0])
 
     def stats(self, simulation_id: str, conn: Connection | None = None) -> dict:
         """Return diagnostic information for a simulation."""
@@ -228,6 +207,7 @@ class SimulationStore:
                 ORDER BY called_at;
                 """,
                 (simulation_id,),
+                prepare=True,
             )
             calls = cur.fetchall()
 
@@ -248,14 +228,10 @@ class SimulationStore:
         if conn is None:
             return
 
-        try:
-            with conn.cursor() as cur:
-                cur.execute("TRUNCATE TABLE simulation_calls;")
-                cur.execute("TRUNCATE TABLE simulation_runs;")
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+        with conn.transaction(), conn.cursor() as cur:
+            cur.execute("TRUNCATE TABLE simulation_calls;")
+            cur.execute("TRUNCATE TABLE simulation_run_calls;")
+            cur.execute("TRUNCATE TABLE simulation_runs;")
 
 
 simulation_store = SimulationStore()
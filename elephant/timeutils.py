@@ -0,0 +1,11 @@
+"""Datetime helpers shared by the API and the providers."""
+
+import sys
+from datetime import datetime
+
+if sys.version_info >= (3, 11):
+    fromisoformat = datetime.fromisoformat  # Accepts the "Z" suffix natively
+else:
+    def fromisoformat(value: str) -> datetime:
+        """`datetime.fromisoformat` that also accepts the "Z" suffix, which it only does natively from 3.11 on."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
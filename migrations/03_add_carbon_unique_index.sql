@@ -0,0 +1,10 @@
+-- Rows written by concurrent cron runs before this index existed may be duplicated. Keep one of each.
+DELETE FROM carbon a
+USING carbon b
+WHERE a.time = b.time
+  AND a.region = b.region
+  AND a.provider = b.provider
+  AND a.ctid < b.ctid;
+
+-- Region and provider first so the per-provider lookups of the API and cron can use it for their time ranges.
+CREATE UNIQUE INDEX IF NOT EXISTS carbon_region_provider_time_idx ON carbon (region, provider, time);
@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS regions (
+  region  TEXT PRIMARY KEY
+);
+
+INSERT INTO regions (region)
+SELECT DISTINCT region FROM carbon WHERE region IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,4 @@
+-- `stats` reads a run's calls in called_at order. With the payload columns included that's an index only scan
+-- instead of a heap fetch plus sort. Not CONCURRENTLY since migrations run inside a transaction.
+CREATE INDEX IF NOT EXISTS simulation_calls_by_run
+  ON simulation_calls (simulation_id, called_at) INCLUDE (carbon_intensity, idx);
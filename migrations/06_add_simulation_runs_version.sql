@@ -0,0 +1,2 @@
+-- Bumped on every write so `current_value` can count down without holding a row lock.
+ALTER TABLE simulation_runs ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,25 @@
+CREATE TABLE IF NOT EXISTS simulation_run_calls (
+  simulation_id  UUID NOT NULL REFERENCES simulation_runs(simulation_id) ON DELETE CASCADE,
+  idx            INTEGER NOT NULL,
+  remaining      INTEGER NOT NULL,
+  PRIMARY KEY (simulation_id, idx)
+);
+
+-- Databases created before this table kept the call limits in a simulation_runs.calls array. Move them over
+-- (values without a limit get no row) and drop the array, so a countdown no longer rewrites it.
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'simulation_runs' AND column_name = 'calls'
+  ) THEN
+    INSERT INTO simulation_run_calls (simulation_id, idx, remaining)
+    SELECT r.simulation_id, counts.idx - 1, counts.remaining
+    FROM simulation_runs AS r, unnest(r.calls) WITH ORDINALITY AS counts (remaining, idx)
+    WHERE counts.remaining IS NOT NULL
+    ON CONFLICT DO NOTHING;
+
+    ALTER TABLE simulation_runs DROP COLUMN calls;
+  END IF;
+END $$;
@@ -1,11 +1,19 @@
 """Tests for FastAPI application endpoints."""
 
+import asyncio
+import gc
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
 
 import pytest
-from fastapi import HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from psycopg_pool import PoolTimeout
 
 from elephant import app as app_module
+from elephant.providers import helpers as helpers_module
 from elephant.app import (
     get_primary_carbon_intensity,
     get_current_carbon_intensity,
@@ -13,12 +21,22 @@ from elephant.app import (
     get_v3_carbon_intensity_history,
     get_carbon_intensity_history,
     list_regions,
+    list_providers,
     health_check,
+    health_live,
+    health_ready,
     index,
 )
+from elephant.database import CarbonRow, LazyConnection, carbon_row
 from elephant.config import Config, CronConfig, DatabaseConfig, LoggingConfig, Source
 
 
+@pytest.fixture(autouse=True)
+def _empty_response_cache(monkeypatch) -> None:
+    """Keep cached DB reads from leaking between tests."""
+    monkeypatch.setattr(app_module, "_response_cache", {})
+
+
 def _make_config(primary_provider: str = "energycharts") -> Config:
     """Helper to build a minimal Config for tests."""
     return Config(
@@ -59,22 +77,158 @@ async def test_get_current_carbon_intensity_success(monkeypatch) -> None:
     assert result["provider"]["carbon_intensity"] == 123
 
 
+@pytest.mark.asyncio
+async def test_get_current_carbon_intensity_is_cached(monkeypatch) -> None:
+    """Repeated current requests are served from the cache until an update invalidates it."""
+    calls = []
+
+    def fake_fetch_latest(db, region, provider=None):
+        calls.append(region)
+        return [{"provider": "energycharts_de", "carbon_intensity": len(calls)}]
+
+    async def fake_run_in_threadpool(func, *args, specific_region=None, **kwargs):
+        return None if specific_region else func(*args, **kwargs)
+
+    monkeypatch.setattr(app_module, "fetch_latest", fake_fetch_latest)
+    monkeypatch.setattr(app_module, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(app_module, "_last_updates", {})
+
+    first = await get_current_carbon_intensity(region="DE", update=False, db=object())
+    second = await get_current_carbon_intensity(region="DE", update=False, db=object())
+    updated = await get_current_carbon_intensity(region="DE", update=True, db=object())
+
+    assert first == second == [{"provider": "energycharts_de", "carbon_intensity": 1}]
+    assert updated == [{"provider": "energycharts_de", "carbon_intensity": 2}]
+    assert calls == ["DE", "DE"]
+
+
 @pytest.mark.asyncio
 async def test_get_current_carbon_intensity_triggers_update(monkeypatch) -> None:
     """Current endpoint triggers cron when update=True."""
     called = {}
 
-    async def fake_run_in_threadpool(func, specific_region=None):
+    async def fake_run_in_threadpool(func, *args, specific_region=None, **kwargs):
+        if specific_region is None:
+            return func(*args, **kwargs)  # DB reads
         called["region"] = specific_region
         return None
 
     monkeypatch.setattr(app_module, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(app_module, "_last_updates", {})
     monkeypatch.setattr(app_module, "fetch_latest", lambda db, region: {"provider": {"carbon_intensity": 1}} )
 
     await get_current_carbon_intensity(region="FR", update=True, db=object())
     assert called["region"] == "FR"
 
 
+@pytest.mark.asyncio
+async def test_update_waiters_do_not_hold_pool_connections(monkeypatch) -> None:
+    """The pooled connection is only checked out after the update run, when the endpoint reads the data."""
+    checkouts = []
+
+    class _FakePool:
+        @contextmanager
+        def connection(self):
+            checkouts.append(True)
+            yield SimpleNamespace(name="pooled")
+
+    db = LazyConnection(_FakePool())
+    held_during_update = []
+
+    async def fake_run_in_threadpool(func, *args, specific_region=None, **kwargs):
+        if specific_region is None:
+            return func(*args, **kwargs)  # DB reads
+        held_during_update.append(db.checked_out)
+        return None
+
+    monkeypatch.setattr(app_module, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(app_module, "_last_updates", {})
+    monkeypatch.setattr(app_module, "fetch_latest", lambda conn, region: [{"conn": conn.name}])
+
+    result = await get_current_carbon_intensity(region="FR", update=True, db=db)
+
+    assert held_during_update == [False]
+    assert result == [{"conn": "pooled"}]
+    assert checkouts == [True]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_share_one_cron_run(monkeypatch) -> None:
+    """Concurrent update requests for the same region are served by a single queued cron run."""
+    calls = []
+
+    async def fake_run_in_threadpool(func, specific_region=None, specific_provider=None):
+        calls.append((specific_region, specific_provider))
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(app_module, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(app_module, "_pending_updates", {})
+    monkeypatch.setattr(app_module, "_last_updates", {})
+
+    queue = asyncio.Queue()
+    monkeypatch.setattr(app_module.app.state, "cron_queue", queue, raising=False)
+    worker = asyncio.create_task(app_module._cron_worker(queue))
+
+    try:
+        await asyncio.gather(*(app_module._handle_update(True, "DE") for _ in range(5)))
+        await app_module._handle_update("EnergyCharts", "FR")
+    finally:
+        worker.cancel()
+
+    assert calls == [("DE", None), ("FR", "energycharts")]
+
+
+@pytest.mark.asyncio
+async def test_failed_update_without_waiters_is_retrieved(monkeypatch, caplog) -> None:
+    """A failing cron run is logged by the worker and its future doesn't report an unretrieved exception."""
+
+    async def failing_run_update(region, provider):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(app_module, "_run_update", failing_run_update)
+    monkeypatch.setattr(app_module, "_pending_updates", {})
+
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+    queue = asyncio.Queue()
+    future = loop.create_future()
+    worker = asyncio.create_task(app_module._cron_worker(queue))
+
+    try:
+        await queue.put((("DE", None), future))
+        await queue.join()
+        await asyncio.sleep(0)  # let the done callbacks run
+        del future
+        gc.collect()
+    finally:
+        worker.cancel()
+        loop.set_exception_handler(None)
+
+    assert not unhandled
+    assert "provider down" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_recent_updates_are_skipped(monkeypatch) -> None:
+    """Updates within MIN_UPDATE_SECONDS of a finished run don't trigger the cron again."""
+    calls = []
+
+    async def fake_run_in_threadpool(func, specific_region=None, specific_provider=None):
+        calls.append((specific_region, specific_provider))
+
+    monkeypatch.setattr(app_module, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(app_module, "_last_updates", {})
+
+    await app_module._handle_update(True, "DE")
+    await app_module._handle_update(True, "DE")
+    await app_module._handle_update("energycharts", "DE")  # covered by the region wide update
+    await app_module._handle_update(True, "FR")
+
+    assert calls == [("DE", None), ("FR", None)]
+
+
 @pytest.mark.asyncio
 async def test_get_current_carbon_intensity_uses_simulation_when_provided(monkeypatch) -> None:
     """Current endpoint returns simulation response when simulationId is supplied."""
@@ -98,11 +252,11 @@ async def test_get_current_carbon_intensity_uses_simulation_when_provided(monkey
 async def test_get_v3_carbon_intensity_current_formats_primary(monkeypatch) -> None:
     """v3 current endpoint returns EM formatted payload from primary data."""
     sample_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
-    monkeypatch.setattr(
-        app_module,
-        "get_primary_carbon_intensity",
-        lambda region, update, db: {"primary": {"time": sample_time, "carbon_intensity": 111}},
-    )
+
+    async def fake_get_primary_carbon_intensity(region, update, db):
+        return [{"provider": "energycharts_de", "time": sample_time, "carbon_intensity": 111}]
+
+    monkeypatch.setattr(app_module, "get_primary_carbon_intensity", fake_get_primary_carbon_intensity)
 
     result = await get_v3_carbon_intensity_current(zone="de", db=object())
 
@@ -146,14 +300,16 @@ async def test_get_primary_carbon_intensity_returns_primary(monkeypatch) -> None
     """Primary endpoint returns only the configured primary provider entry."""
     app_module.config = _make_config(primary_provider="energycharts")
 
-    # Stub fetch_latest to simulate DB results
+    rows = [
+        {"provider": "energycharts_de","time": "t1", "carbon_intensity": 111},
+        {"provider": "bundesnetzagentur_de", "time": "t2", "carbon_intensity": 222},
+    ]
+
+    # Stub fetch_latest to simulate the DB filtering on the provider
     monkeypatch.setattr(
         app_module,
         "fetch_latest",
-        lambda db, region: [
-            {"provider": "energycharts_de","time": "t1", "carbon_intensity": 111},
-            {"provider": "bundesnetzagentur_de", "time": "t2", "carbon_intensity": 222},
-        ],
+        lambda db, region, provider=None: [row for row in rows if provider in (None, row["provider"])],
     )
 
     result = await get_primary_carbon_intensity(region="DE", update=False, db=object())
@@ -170,8 +326,10 @@ async def test_get_primary_carbon_intensity_missing_primary_data(monkeypatch) ->
     monkeypatch.setattr(
         app_module,
         "fetch_latest",
-        lambda db, region: [
-            {"provider":"bundesnetzagentur", "time": "t2", "carbon_intensity": 222},
+        lambda db, region, provider=None: [
+            row
+            for row in [{"provider":"bundesnetzagentur", "time": "t2", "carbon_intensity": 222}]
+            if provider in (None, row["provider"])
         ],
     )
 
@@ -182,6 +340,24 @@ async def test_get_primary_carbon_intensity_missing_primary_data(monkeypatch) ->
     assert "primary provider" in str(exc.value.detail).lower()
 
 
+@pytest.mark.asyncio
+async def test_primary_lookup_follows_config_changes(monkeypatch) -> None:
+    """Primary provider and provider listing are rebuilt when the config is replaced."""
+    monkeypatch.setattr(app_module, "config", _make_config(primary_provider="energycharts"))
+    assert app_module._get_primary_source("de") == "energycharts_de"
+
+    monkeypatch.setattr(app_module, "config", _make_config(primary_provider="electricitymaps"))
+    assert app_module._get_primary_source("DE") == "electricitymaps_de"
+    assert await list_providers(db=object()) == [
+        ("electricitymaps", "DE", "electricitymaps_de"),
+        ("bundesnetzagentur", "DE", "bundesnetzagentur_de"),
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        app_module._get_primary_source("FR")
+    assert exc.value.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_v3_carbon_intensity_history_returns_last_24_hours(monkeypatch) -> None:
     """v3 history endpoint returns 24h window in EM format."""
@@ -189,13 +365,14 @@ async def test_get_v3_carbon_intensity_history_returns_last_24_hours(monkeypatch
     t1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
     t2 = datetime(2024, 1, 2, tzinfo=timezone.utc)
 
-    def fake_fetch_between(db, region, start, end, provider=None):
+    def fake_fetch_between(db, region, start, end, provider=None, row_factory=None):
         captured["region"] = region
         captured["start"] = start
         captured["end"] = end
+        captured["row_factory"] = row_factory
         return [
-            {"time": t1, "carbon_intensity": 100},
-            {"time": t2, "carbon_intensity": 200},
+            CarbonRow(time=t1, carbon_intensity=100, provider="energycharts_de", estimation=False),
+            CarbonRow(time=t2, carbon_intensity=200, provider="energycharts_de", estimation=False),
         ]
 
     monkeypatch.setattr(app_module, "fetch_between", fake_fetch_between)
@@ -206,6 +383,7 @@ async def test_get_v3_carbon_intensity_history_returns_last_24_hours(monkeypatch
     assert len(result["history"]) == 2
     assert result["history"][0]["carbonIntensity"] == 100.0
     assert captured["end"] - captured["start"] == timedelta(hours=24)
+    assert captured["row_factory"] is carbon_row
     assert result["history"][0]["datetime"].endswith("Z")
 
 
@@ -242,10 +420,100 @@ async def test_get_carbon_intensity_history(monkeypatch) -> None:
     assert result == sample
 
 
+@pytest.mark.parametrize("region, expected", [("de", "DE"), ("DE", "DE"), ("no-no2", "NO-NO2")])
+def test_normalize_region(region, expected) -> None:
+    """Regions are validated and upper-cased."""
+    assert app_module._normalize_region(region) == expected
+
+
+@pytest.mark.parametrize("region", ["D", "1A", "DE\n", "DE;"])
+def test_normalize_region_rejects_invalid(region) -> None:
+    """Malformed region codes are rejected with a 400."""
+    with pytest.raises(HTTPException) as exc:
+        app_module._normalize_region(region)
+    assert exc.value.status_code == 400
+
+
+def test_normalize_region_memoizes_valid_regions() -> None:
+    """Accepted regions are served from the cache, rejected ones keep raising."""
+    app_module._normalize_region.cache_clear()
+
+    assert app_module._normalize_region("fr") == "FR"
+    assert app_module._normalize_region("fr") == "FR"
+    assert app_module._normalize_region.cache_info().hits == 1
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            app_module._normalize_region("F")
+
+
+def test_to_iso_formats_utc_with_z_suffix() -> None:
+    """UTC, naive and offset datetimes all render as UTC with a Z suffix."""
+    assert app_module._to_iso(datetime(2024, 1, 1, 12, tzinfo=timezone.utc)) == "2024-01-01T12:00:00Z"
+    assert app_module._to_iso(datetime(2024, 1, 1, 12, 0, 0, 5)) == "2024-01-01T12:00:00.000005Z"
+    assert app_module._to_iso(datetime(2024, 1, 1, 14, tzinfo=timezone(timedelta(hours=2)))) == "2024-01-01T12:00:00Z"
+    assert app_module._to_iso(datetime(2024, 1, 1, 12, tzinfo=ZoneInfo("Etc/UTC"))) == "2024-01-01T12:00:00Z"
+
+
+def test_to_iso_skips_conversion_for_zoneinfo_utc() -> None:
+    """Rows from a session with TimeZone "Etc/UTC" carry a ZoneInfo, which still takes the no-conversion path."""
+
+    class NoConversion(datetime):
+        def astimezone(self, tz=None):
+            raise AssertionError("UTC datetimes should not be converted")
+
+    assert app_module._to_iso(NoConversion(2024, 1, 1, 12, tzinfo=ZoneInfo("Etc/UTC"))) == "2024-01-01T12:00:00Z"
+
+
+def test_parse_iso_accepts_z_suffix() -> None:
+    """Request timestamps with a Z suffix are parsed as UTC."""
+    assert app_module._parse_iso("2025-09-22T10:00:00Z") == datetime(2025, 9, 22, 10, tzinfo=timezone.utc)
+    assert app_module._parse_iso("2025-09-22T10:00:00") == datetime(2025, 9, 22, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_get_carbon_intensity_history_mixed_offsets(monkeypatch) -> None:
+    """A naive and an offset timestamp can be combined as naive ones are taken as UTC."""
+    captured = {}
+
+    def fake_fetch_between(db, region, start, end, provider=None):
+        captured["start"], captured["end"] = start, end
+        return []
+
+    monkeypatch.setattr(app_module, "fetch_between", fake_fetch_between)
+
+    await get_carbon_intensity_history(
+        region="DE", startTime="2025-09-22T10:00:00", endTime="2025-09-22T13:00:00+02:00", db=object()
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await get_carbon_intensity_history(
+            region="DE", startTime="2025-09-22T10:00:00", endTime="2025-09-22T12:00:00+02:00", db=object()
+        )
+
+    assert captured["end"] - captured["start"] == timedelta(hours=1)
+    assert exc.value.status_code == 400
+
+
+def _use_pool_connection(monkeypatch, conn) -> list:
+    """Make `connection_pool()` hand out `conn`, returning the list that records each checkout."""
+    checkouts = []
+
+    @contextmanager
+    def connection():
+        checkouts.append(conn)
+        yield conn
+
+    monkeypatch.setattr(app_module, "connection_pool", lambda: SimpleNamespace(connection=connection))
+    return checkouts
+
+
 @pytest.mark.asyncio
 async def test_health_check(monkeypatch) -> None:
     """Health endpoint reports providers and record count."""
-    monkeypatch.setattr(app_module, "get_providers", lambda: {"p1": object(), "p2": object()})
+    monkeypatch.setattr(helpers_module, "get_providers", lambda: {"p1": object(), "p2": object()})
+    monkeypatch.setattr(app_module, "_health_cache", {})
+    monkeypatch.setattr(app_module.app.state, "health_lock", None, raising=False)
 
     class DummyCursor:
         def __enter__(self):
@@ -261,13 +529,120 @@ async def test_health_check(monkeypatch) -> None:
             return (5,)
 
         def fetchall(self):
-            return [{"region": "DE"}, {"region": "FR"}]
+            return [("DE",), ("FR",)]
 
     class DummyDB:
         def cursor(self, *args, **kwargs):
             return DummyCursor()
 
-    result = await health_check(db=DummyDB())
+    _use_pool_connection(monkeypatch, DummyDB())
+    result = await health_check()
     assert result["providers"] == ["p1", "p2"]
     assert result["db_records"] == 5
+    assert result["db_records_estimated"] is True
     assert result["regions"] == ["DE", "FR"]
+
+
+@pytest.mark.asyncio
+async def test_health_check_caches_database_stats(monkeypatch) -> None:
+    """Health endpoint reuses the DB stats within the cache window."""
+    monkeypatch.setattr(helpers_module, "get_providers", lambda: {})
+    monkeypatch.setattr(app_module, "_health_cache", {})
+    monkeypatch.setattr(app_module.app.state, "health_lock", None, raising=False)
+    monkeypatch.setattr(app_module, "fetch_regions", lambda db: ["DE"])
+
+    executed = []
+
+    class DummyCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, sql, *_args, **_kwargs):
+            executed.append(sql)
+
+        def fetchone(self):
+            return (7,)
+
+    class DummyDB:
+        def cursor(self, *args, **kwargs):
+            return DummyCursor()
+
+    checkouts = _use_pool_connection(monkeypatch, DummyDB())
+    first = await health_check()
+    second = await health_check()
+
+    assert first == second
+    assert first["db_records"] == 7
+    assert len(executed) == 1
+    assert len(checkouts) == 1
+
+
+@pytest.mark.asyncio
+async def test_health_live_skips_database() -> None:
+    """Liveness answers without a DB connection."""
+    assert await health_live() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_health_ready_reports_database_failure(monkeypatch) -> None:
+    """Readiness turns an unreachable database into a 503."""
+
+    def failing_ping():
+        raise PoolTimeout("couldn't get a connection after 2.00 sec")
+
+    monkeypatch.setattr(app_module, "_ping_database", failing_ping)
+
+    response = Response()
+    result = await health_ready(response=response)
+
+    assert result["status"] == "error"
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_health_ready_ignores_cached_health(monkeypatch) -> None:
+    """Readiness checks the database itself rather than trusting a cached healthy `/health` result."""
+    monkeypatch.setattr(app_module, "_health_cache", {"db": (time.monotonic(), 3, ["DE"])})
+    pings = []
+    monkeypatch.setattr(app_module, "_ping_database", lambda: pings.append(True))
+
+    response = Response()
+    result = await health_ready(response=response)
+
+    assert result == {"status": "ready"}
+    assert response.status_code == 200
+    assert pings == [True]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_creates_loop_bound_state() -> None:
+    """The update queue and the health lock are created by the lifespan, inside the running loop."""
+    fastapi_app = FastAPI()
+
+    async with app_module.lifespan(fastapi_app):
+        assert isinstance(fastapi_app.state.cron_queue, asyncio.Queue)
+        assert isinstance(fastapi_app.state.health_lock, asyncio.Lock)
+
+
+@pytest.mark.asyncio
+async def test_health_check_coalesces_concurrent_refreshes(monkeypatch) -> None:
+    """Concurrent probes on a cold cache share a single DB query."""
+    monkeypatch.setattr(helpers_module, "get_providers", lambda: {})
+    monkeypatch.setattr(app_module, "_health_cache", {})
+    monkeypatch.setattr(app_module.app.state, "health_lock", None, raising=False)
+
+    calls = []
+
+    def fake_stats():
+        calls.append(True)
+        return 3, ["DE"]
+
+    monkeypatch.setattr(app_module, "_health_stats", fake_stats)
+
+    results = await asyncio.gather(*(health_check() for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result["db_records"] == 3 for result in results)
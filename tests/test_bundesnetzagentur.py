@@ -23,3 +23,104 @@ def test_get_current_returns_expected_format():
         assert entry["time"].tzinfo is not None
         assert isinstance(entry["carbon_intensity"], (int, float))
         assert entry["provider"] == "bundesnetzagentur"
+
+
+def _fake_smard(monkeypatch, generation: dict[str, dict[int, float]]) -> list[str]:
+    """Serve SMARD index and series files from memory and record the requested URLs.
+
+    The load covers two timestamps; filters not in `generation` report 0 MW for the first one only.
+    """
+    from elephant.providers import bna_helper
+
+    requested = []
+
+    def fake_fetch_json(url: str):
+        requested.append(url)
+        if "index_" in url:
+            return {"timestamps": [1000, 2000]}
+
+        smard_filter = url.rsplit("/", 1)[1].split("_", 1)[0]
+        if smard_filter == str(bna_helper.LOAD_FILTER):
+            return {"series": [[1000, 50.0], [2000, 60.0]]}
+        return {"series": [[t_ms, value] for t_ms, value in generation.get(smard_filter, {1000: 0.0}).items()]}
+
+    monkeypatch.setattr(bna_helper, "fetch_json", fake_fetch_json)
+    return requested
+
+
+def test_get_co2intensity_weights_generation_by_factor(monkeypatch):
+    """Intensity is the generation weighted average of the filter factors, fetched for the latest timestamp."""
+    from elephant.providers import bna_helper
+
+    lignite, solar = "1223", "4068"
+    requested = _fake_smard(monkeypatch, {lignite: {1000: 1.0}, solar: {1000: 3.0}})
+
+    result = bna_helper.get_co2intensity("DE", "quarterhour")
+
+    expected = (bna_helper.filters[lignite] + 3 * bna_helper.filters[solar]) / 4
+    assert result == {datetime.fromtimestamp(1, tz=timezone.utc): expected}
+    assert all(url.endswith("_2000.json") for url in requested if "index_" not in url)
+
+
+def test_fetch_json_reuses_recent_responses(monkeypatch):
+    """A URL fetched within the cache window is served without another request."""
+    from elephant.providers import bna_helper
+
+    calls = []
+
+    class _Response:
+        content = b'{"timestamps": [1]}'
+
+        def raise_for_status(self):
+            return None
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return _Response()
+
+    monkeypatch.setattr(bna_helper, "_fetch_cache", {})
+    monkeypatch.setattr(bna_helper._SESSION, "get", fake_get)
+
+    assert bna_helper.fetch_json("https://example.invalid/a.json") == {"timestamps": [1]}
+    assert bna_helper.fetch_json("https://example.invalid/a.json") == {"timestamps": [1]}
+    assert calls == ["https://example.invalid/a.json"]
+
+
+def test_fetch_json_cache_drops_expired_and_stays_bounded(monkeypatch):
+    """Expired files are purged on insert and the cache never outgrows one run's worth of files."""
+    from elephant.providers import bna_helper
+
+    class _Response:
+        content = b"{}"
+
+        def raise_for_status(self):
+            return None
+
+    clock = [0.0]
+    monkeypatch.setattr(bna_helper, "_fetch_cache", {})
+    monkeypatch.setattr(bna_helper._SESSION, "get", lambda url, timeout: _Response())
+    monkeypatch.setattr(bna_helper.time, "monotonic", lambda: clock[0])
+
+    bna_helper.fetch_json("https://example.invalid/old.json")
+    clock[0] = bna_helper.FETCH_CACHE_SECONDS + 1
+    bna_helper.fetch_json("https://example.invalid/new.json")
+    assert list(bna_helper._fetch_cache) == ["https://example.invalid/new.json"]
+
+    for i in range(3 * bna_helper.FETCH_CACHE_SIZE):
+        bna_helper.fetch_json(f"https://example.invalid/{i}.json")
+    assert len(bna_helper._fetch_cache) == bna_helper.FETCH_CACHE_SIZE
+
+
+def test_get_historical_keeps_entries_inside_window(monkeypatch):
+    """Only entries between start_time and end_time (inclusive) are returned."""
+    provider = BundesnetzagenturProvider(ProviderConfig())
+    times = [datetime.fromtimestamp(ts, tz=timezone.utc) for ts in (1000, 2000, 3000, 4000)]
+    monkeypatch.setattr(
+        provider, "get_current", lambda region: [{"time": t, "carbon_intensity": 1.0} for t in times]
+    )
+
+    result = provider.get_historical("DE", start_time=times[1], end_time=times[2])
+    assert [entry["time"] for entry in result] == times[1:3]
+
+    result = provider.get_historical("DE", start_time=times[2])
+    assert [entry["time"] for entry in result] == times[2:]
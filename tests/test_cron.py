@@ -2,6 +2,9 @@
 
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
 
 from elephant import cron as cron_module
 from elephant.config import Config, CronConfig, DatabaseConfig, LoggingConfig, Source
@@ -12,6 +15,7 @@ class _FakeCursor:
         self.conn = conn
         self.rowcount = 0
         self._fetchone = None
+        self._fetchall = []
 
     def __enter__(self):
         return self
@@ -19,7 +23,7 @@ class _FakeCursor:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def execute(self, _sql, _params=None) -> None:
+    def execute(self, _sql, _params=None, **_kwargs) -> None:
         sql = " ".join(_sql.lower().split())
 
         if "select last_run from last_cron_run" in sql:
@@ -36,17 +40,31 @@ class _FakeCursor:
             self._fetchone = None
             return
 
+        if "from carbon where" in sql:
+            self._fetchall = [row for row in self.conn.carbon_rows if row[0] in _params[2]]
+            return
+
         self.rowcount = 1
         self._fetchone = None
 
+    def executemany(self, _sql, params_seq) -> None:
+        sql = " ".join(_sql.lower().split())
+        self.conn.batches.append((sql, list(params_seq)))
+
     def fetchone(self):
         return self._fetchone
 
+    def fetchall(self):
+        return self._fetchall
+
 
 class _FakeConnection:
     def __init__(self) -> None:
         self.commits = 0
         self.last_runs = {}
+        # (time, region, carbon_intensity, estimation) rows already stored for the provider under test
+        self.carbon_rows = []
+        self.batches = []
 
     def cursor(self):
         return _FakeCursor(self)
@@ -121,6 +139,33 @@ def test_run_cron_uses_current_when_only_get_current_enabled(monkeypatch) -> Non
     assert conn.commits == 1
 
 
+def test_run_cron_uses_the_pool_only_when_asked(monkeypatch) -> None:
+    """Service loop runs borrow a pooled connection, API started runs open their own."""
+    provider = _CountingProvider()
+    cfg = _make_config(Source(region="DE", provider="energycharts", only_get_current=True))
+    pooled_conn = _FakeConnection()
+    own_conn = _FakeConnection()
+
+    @contextmanager
+    def _fake_pool_connection():
+        yield pooled_conn
+
+    @contextmanager
+    def _fake_db_connection():
+        yield own_conn
+
+    monkeypatch.setattr(cron_module, "config", cfg)
+    monkeypatch.setattr(cron_module, "get_providers", lambda: {"energycharts_de": provider})
+    monkeypatch.setattr(cron_module, "connection_pool", lambda: SimpleNamespace(connection=_fake_pool_connection))
+    monkeypatch.setattr(cron_module, "db_connection", _fake_db_connection)
+
+    cron_module.run_cron(specific_region="DE")
+    assert (pooled_conn.commits, own_conn.commits) == (0, 1)
+
+    cron_module.run_cron(pooled=True)
+    assert (pooled_conn.commits, own_conn.commits) == (1, 1)
+
+
 def test_run_cron_uses_historical_by_default(monkeypatch) -> None:
     provider = _CountingProvider()
     cfg = _make_config(Source(region="DE", provider="energycharts"))
@@ -208,3 +253,85 @@ def test_run_cron_force_run_bypasses_update_iterval(monkeypatch) -> None:
     assert provider.historical_calls == 1
     assert provider.future_calls == 1
     assert conn.commits == 1
+
+
+def test_run_cron_batches_inserts_and_overwrites(monkeypatch) -> None:
+    t1, t2, t3 = (datetime(2025, 1, 1, hour, tzinfo=timezone.utc) for hour in (1, 2, 3))
+
+    class _Provider(_CountingProvider):
+        def get_historical(self, region: str):
+            return [
+                {"region": region, "time": t, "carbon_intensity": value, "provider": "energycharts",
+                 "resolution": "15_minutes", "estimation": False}
+                for t, value in ((t1, 100.0), (t2, 200.0), (t3, 300.0))
+            ]
+
+    cfg = _make_config(Source(region="DE", provider="energycharts"))
+    conn = _FakeConnection()
+    conn.carbon_rows = [(t1, "DE", 100.0, False), (t2, "DE", 150.0, False)]
+
+    @contextmanager
+    def _fake_db_connection():
+        yield conn
+
+    monkeypatch.setattr(cron_module, "config", cfg)
+    monkeypatch.setattr(cron_module, "get_providers", lambda: {"energycharts_de": _Provider()})
+    monkeypatch.setattr(cron_module, "db_connection", _fake_db_connection)
+
+    cron_module.run_cron()
+
+    def _batch(prefix: str):
+        return next(params for sql, params in conn.batches if sql.startswith(prefix))
+
+    assert _batch("insert into carbon ") == [(t3, "DE", 300.0, "energycharts_de", False)]
+    assert _batch("insert into carbon_overwrites") == [(t2, "DE", "energycharts_de", 150.0, 200.0, False, False)]
+    assert _batch("update carbon") == [(200.0, False, t2, "DE", "energycharts_de")]
+    assert conn.commits == 1
+
+
+def test_run_cron_rejects_unexpected_keys(monkeypatch) -> None:
+    class _Provider(_CountingProvider):
+        def get_historical(self, region: str):
+            return [{"region": region, "time": datetime.now(tz=timezone.utc), "carbon_intensity": 1.0}]
+
+    cfg = _make_config(Source(region="DE", provider="energycharts"))
+    conn = _FakeConnection()
+
+    @contextmanager
+    def _fake_db_connection():
+        yield conn
+
+    monkeypatch.setattr(cron_module, "config", cfg)
+    monkeypatch.setattr(cron_module, "get_providers", lambda: {"energycharts_de": _Provider()})
+    monkeypatch.setattr(cron_module, "db_connection", _fake_db_connection)
+
+    with pytest.raises(ValueError, match="invalid keys"):
+        cron_module.run_cron()
+
+    assert conn.batches == []
+
+
+def test_run_cron_records_regions_of_inserted_rows(monkeypatch) -> None:
+    provider = _CountingProvider()
+    cfg = _make_config(Source(region="DE", provider="energycharts"))
+    conn = _FakeConnection()
+    executed = []
+
+    class _RecordingCursor(_FakeCursor):
+        def execute(self, _sql, _params=None, **_kwargs) -> None:
+            executed.append((" ".join(_sql.lower().split()), _params))
+            super().execute(_sql, _params, **_kwargs)
+
+    conn.cursor = lambda: _RecordingCursor(conn)
+
+    @contextmanager
+    def _fake_db_connection():
+        yield conn
+
+    monkeypatch.setattr(cron_module, "config", cfg)
+    monkeypatch.setattr(cron_module, "get_providers", lambda: {"energycharts_de": provider})
+    monkeypatch.setattr(cron_module, "db_connection", _fake_db_connection)
+
+    cron_module.run_cron()
+
+    assert [params for sql, params in executed if sql.startswith("insert into regions")] == [(["DE"],)]
@@ -0,0 +1,93 @@
+"""Tests for the database connection pool."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+
+from elephant import database as database_module
+
+
+class _FakePool:
+    """Stands in for psycopg_pool.ConnectionPool and records how often it is built and closed."""
+
+    created = 0
+
+    def __init__(self, *_args, **_kwargs):
+        # Slow enough that concurrent callers would all get here without the lock
+        time.sleep(0.05)
+        type(self).created += 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_pool_is_opened_once_under_concurrency(monkeypatch) -> None:
+    """Concurrent first callers share one pool instead of each opening their own."""
+    monkeypatch.setattr(database_module, "ConnectionPool", _FakePool)
+    monkeypatch.setattr(database_module, "_pool", {})
+    _FakePool.created = 0
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pools = list(executor.map(lambda _: database_module.connection_pool(), range(8)))
+
+    assert _FakePool.created == 1
+    assert all(pool is pools[0] for pool in pools)
+
+    database_module.close_connection_pool()
+    assert pools[0].closed
+    assert database_module._pool == {}
+
+
+class _RecordingPool:
+    """Pool whose connections record how their checkout ended."""
+
+    def __init__(self):
+        self.events = []
+
+    @contextmanager
+    def connection(self):
+        self.events.append("checkout")
+        try:
+            yield self
+        except Exception:
+            self.events.append("rollback")
+            raise
+        self.events.append("commit")
+
+    def execute(self, query):
+        self.events.append(query)
+
+
+def test_connection_dependency_checks_out_on_first_use(monkeypatch) -> None:
+    """Requests that never touch the DB don't take a connection; the ones that do commit at the end."""
+    pool = _RecordingPool()
+    monkeypatch.setattr(database_module, "connection_pool", lambda: pool)
+
+    unused = database_module.connection_dependency()
+    next(unused)
+    with pytest.raises(StopIteration):
+        next(unused)
+    assert not pool.events
+
+    used = database_module.connection_dependency()
+    conn = next(used)
+    conn.execute("SELECT 1;")
+    with pytest.raises(StopIteration):
+        next(used)
+    assert pool.events == ["checkout", "SELECT 1;", "commit"]
+
+
+def test_connection_dependency_rolls_back_on_error(monkeypatch) -> None:
+    """An error raised by the endpoint rolls the borrowed connection back."""
+    pool = _RecordingPool()
+    monkeypatch.setattr(database_module, "connection_pool", lambda: pool)
+
+    dependency = database_module.connection_dependency()
+    next(dependency).execute("SELECT 1;")
+    with pytest.raises(RuntimeError):
+        dependency.throw(RuntimeError("endpoint failed"))
+
+    assert pool.events == ["checkout", "SELECT 1;", "rollback"]
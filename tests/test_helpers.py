@@ -2,6 +2,7 @@
 
 import pytest
 from elephant.providers import helpers
+from elephant.providers.base import http_session
 from elephant.config import Config, DatabaseConfig, CronConfig, LoggingConfig, Source
 
 
@@ -57,3 +58,27 @@ def test_unknown_provider(monkeypatch) -> None:
 
     with pytest.raises(ValueError):
         helpers.get_providers()
+
+
+def test_get_providers_reuses_instances_until_config_changes(monkeypatch) -> None:
+    """Repeated calls share provider instances; a new config builds new ones."""
+    monkeypatch.setattr(helpers, "_providers_cache", {})
+    monkeypatch.setattr(helpers, "config", make_config(sources=[Source(region="DE", provider="energycharts")]))
+
+    first = helpers.get_providers()
+    assert helpers.get_providers() is first
+
+    monkeypatch.setattr(helpers, "config", make_config(sources=[Source(region="FR", provider="energycharts")]))
+
+    assert set(helpers.get_providers().keys()) == {"energycharts_fr"}
+
+
+def test_http_session_only_retries_quick_failures() -> None:
+    """Retries cover failed connects and gateway errors, never read timeouts or an upstream Retry-After."""
+    retries = http_session().get_adapter("https://example.com").max_retries
+
+    assert retries.total == 3
+    assert retries.connect == 2
+    assert retries.read == 0
+    assert set(retries.status_forcelist) == {502, 503, 504}
+    assert retries.respect_retry_after_header is False
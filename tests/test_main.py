@@ -0,0 +1,36 @@
+"""Tests for the command line entry point."""
+
+import pytest
+
+from elephant.__main__ import parse_args
+
+
+def test_parse_args_defaults() -> None:
+    """No arguments yields the documented defaults."""
+    assert parse_args([]) == {"debug": False, "host": "0.0.0.0", "port": 8085}
+
+
+def test_parse_args_values() -> None:
+    """Both `--flag value` and `--flag=value` forms are accepted."""
+    args = parse_args(["--debug", "--host", "127.0.0.1", "--port=9000"])
+
+    assert args == {"debug": True, "host": "127.0.0.1", "port": 9000}
+
+
+@pytest.mark.parametrize("argv", [["--port", "abc"], ["--host"], ["--unknown"]])
+def test_parse_args_rejects_invalid(argv, capsys) -> None:
+    """Invalid input exits with status 2 like argparse."""
+    with pytest.raises(SystemExit) as exc:
+        parse_args(argv)
+
+    assert exc.value.code == 2
+    assert "error" in capsys.readouterr().err
+
+
+def test_parse_args_help(capsys) -> None:
+    """Help prints the usage and exits successfully."""
+    with pytest.raises(SystemExit) as exc:
+        parse_args(["-h"])
+
+    assert exc.value.code == 0
+    assert "--port PORT" in capsys.readouterr().out
@@ -1,5 +1,6 @@
 """Tests for simulation endpoints and state transitions."""
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import pytest
@@ -30,62 +31,81 @@ class FakeCursor:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def execute(self, sql, params=None):
+    def execute(self, sql, params=None, **_kwargs):
         normalized = " ".join(sql.split()).lower()
         params = params or ()
+        self.conn.statements.append(normalized)
 
-        if "insert into simulation_runs" in normalized:
-            if len(params) == 4:
-                sim_id, values, calls, current_index = params
-            else:
-                sim_id, values, current_index = params
-                calls = [None] * len(values)
-
-            self.conn.sim_runs[sim_id] = {
-                "grid_values": list(values),
-                "calls": list(calls) if calls is not None else [None] * len(values),
-                "current_index": current_index,
-            }
-            self._results = []
-        elif "select grid_values" in normalized:
-            sim_id = params[0]
+        if "with run as ( select" in normalized:
+            sim_id, called_at = params
             run = self.conn.sim_runs.get(sim_id)
-            self._results = [run] if run else []
-        elif "update simulation_runs" in normalized:
-            if len(params) == 3:
-                new_idx, calls, sim_id = params
-            else:
-                new_idx, sim_id = params
-                calls = self.conn.sim_runs.get(sim_id, {}).get("calls")
-
-            if sim_id in self.conn.sim_runs:
-                self.conn.sim_runs[sim_id]["current_index"] = new_idx
-                if calls is not None:
-                    self.conn.sim_runs[sim_id]["calls"] = list(calls)
             self._results = []
-        elif "insert into simulation_calls" in normalized:
-            sim_id, called_at, carbon_intensity, idx = params
-            self.conn.calls.append(
-                {
-                    "simulation_id": sim_id,
-                    "called_at": called_at,
-                    "carbon_intensity": carbon_intensity,
-                    "idx": idx,
-                }
-            )
+            if run:
+                conflicted = self.conn.conflicts > 0
+                self._results = [(run["grid_values"][run["current_index"]], conflicted)]
+                if conflicted:
+                    self.conn.conflicts -= 1
+                else:
+                    self._count_down(sim_id, run, called_at)
+        elif "insert into simulation_runs" in normalized:
+            sim_id, values, calls, called_at = params
+            self.conn.sim_runs[sim_id] = {"grid_values": list(values), "current_index": 0}
+            for idx, remaining in enumerate(calls):
+                if remaining is not None:
+                    self.conn.run_calls[(sim_id, idx)] = remaining
+            self._record_call(sim_id, called_at, values[0], 0)
             self._results = []
+        elif "with moved as ( update simulation_runs" in normalized:
+            sim_id, called_at, _ = params
+            run = self.conn.sim_runs.get(sim_id)
+            self._results = []
+            if run:
+                if run["current_index"] + 1 < len(run["grid_values"]):
+                    run["current_index"] += 1
+                    self._record_call(sim_id, called_at, run["grid_values"][run["current_index"]], run["current_index"])
+                self._results = [(run["grid_values"][run["current_index"]],)]
         elif "select called_at" in normalized:
             sim_id = params[0]
             self._results = [call for call in self.conn.calls if call["simulation_id"] == sim_id]
         elif "truncate table simulation_calls" in normalized:
             self.conn.calls = []
             self._results = []
+        elif "truncate table simulation_run_calls" in normalized:
+            self.conn.run_calls = {}
+            self._results = []
         elif "truncate table simulation_runs" in normalized:
             self.conn.sim_runs = {}
             self._results = []
         else:
             raise NotImplementedError(f"SQL not supported: {sql}")
 
+    def _count_down(self, sim_id, run, called_at):
+        """Mirror the server side countdown of `SimulationStore.current_value`.
+
+        The SQL itself is exercised by `tests/test_simulation_db.py`; keep the two in step.
+        """
+        idx = run["current_index"]
+        remaining = self.conn.run_calls.get((sim_id, idx))
+        if remaining is None or remaining < 0:
+            return
+
+        remaining -= 1
+        has_next = idx + 1 < len(run["grid_values"])
+        self.conn.run_calls[(sim_id, idx)] = -1 if remaining <= 0 and not has_next else remaining
+        if remaining <= 0 and has_next:
+            run["current_index"] = idx + 1
+            self._record_call(sim_id, called_at, run["grid_values"][idx + 1], idx + 1)
+
+    def _record_call(self, sim_id, called_at, carbon_intensity, idx):
+        self.conn.calls.append(
+            {
+                "simulation_id": sim_id,
+                "called_at": called_at,
+                "carbon_intensity": carbon_intensity,
+                "idx": idx,
+            }
+        )
+
     def fetchone(self):
         if not self._results:
             return None
@@ -101,19 +121,29 @@ class FakeConnection:
 
     def __init__(self):
         self.sim_runs = {}
+        self.run_calls = {}
         self.calls = []
+        self.statements = []
+        self.conflicts = 0
         self.commits = 0
         self.rollbacks = 0
 
     def cursor(self, row_factory=None):
         return FakeCursor(self, row_factory=row_factory)
 
-    def commit(self):
+    def remaining(self, sim_id):
+        """Call limits of a run by value index, None where the value has none."""
+        return [self.run_calls.get((sim_id, idx)) for idx in range(len(self.sim_runs[sim_id]["grid_values"]))]
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield
+        except Exception:
+            self.rollbacks += 1
+            raise
         self.commits += 1
 
-    def rollback(self):
-        self.rollbacks += 1
-
 
 @pytest.fixture
 def conn():
@@ -162,7 +192,7 @@ async def test_simulation_flow_advances_values(monkeypatch, conn) -> None:
     create_response = await create_simulation(payload, db=conn)
     simulationId = create_response["simulationId"]
 
-    assert conn.sim_runs[simulationId]["calls"] == [None, None, None]
+    assert conn.remaining(simulationId) == [None, None, None]
 
     first = await get_simulation_carbon(simulationId=simulationId, db=conn)
     assert first["carbon_intensity"] == 5.0
@@ -204,7 +234,7 @@ async def test_simulation_flow_advances_values_tuple(monkeypatch, conn) -> None:
     create_response = await create_simulation(payload, db=conn)
     simulationId = create_response["simulationId"]
 
-    assert conn.sim_runs[simulationId]["calls"] == [None, 2, None]
+    assert conn.remaining(simulationId) == [None, 2, None]
 
     first = await get_simulation_carbon(simulationId=simulationId, db=conn)
     assert first["carbon_intensity"] == 5.0
@@ -243,6 +273,16 @@ async def test_simulation_invalid_id_raises_not_found(conn) -> None:
         await get_simulation_carbon(simulationId="missing", db=conn)
 
     assert exc.value.status_code == 404
+    assert conn.rollbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_simulation_next_invalid_id_raises_not_found(conn) -> None:
+    """Advancing an unknown simulation returns a 404 HTTPException."""
+    with pytest.raises(HTTPException) as exc:
+        await advance_simulation(simulationId="missing", db=conn)
+
+    assert exc.value.status_code == 404
 
 
 @pytest.mark.asyncio
@@ -262,7 +302,7 @@ async def test_simulation_persists_and_reads_from_db(conn) -> None:
 
     assert simulationId in conn.sim_runs
     assert conn.sim_runs[simulationId]["current_index"] == 0
-    assert conn.sim_runs[simulationId]["calls"] == [None, None]
+    assert conn.remaining(simulationId) == [None, None]
 
     await advance_simulation(simulationId=simulationId, db=conn)
     assert conn.sim_runs[simulationId]["current_index"] == 1
@@ -287,7 +327,7 @@ async def test_simulation_auto_advances_after_calls(monkeypatch, conn) -> None:
 
     first = await get_simulation_carbon(simulationId=simulationId, db=conn)
     assert first["carbon_intensity"] == 5.0
-    assert conn.sim_runs[simulationId]["calls"][0] == 1
+    assert conn.remaining(simulationId)[0] == 1
 
     second = await get_simulation_carbon(simulationId=simulationId, db=conn)
     assert second["carbon_intensity"] == 5.0
@@ -295,10 +335,68 @@ async def test_simulation_auto_advances_after_calls(monkeypatch, conn) -> None:
 
     third = await get_simulation_carbon(simulationId=simulationId, db=conn)
     assert third["carbon_intensity"] == 10.0
-    assert conn.sim_runs[simulationId]["calls"][1] == -1
+    assert conn.remaining(simulationId)[1] == -1
 
     stats = await simulation_stats(simulationId=simulationId, db=conn)
     assert len(stats) == 2
     assert stats[0]['time'] == fixed_time.isoformat()
     assert stats[0]['carbon_intensity'] == 5.0
     assert stats[1]['carbon_intensity'] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_simulation_records_calls_with_their_update(conn) -> None:
+    """Creating and advancing a run each write the run and its call record in one statement."""
+    conn.statements.clear()
+    create_response = await create_simulation(SimulationCreateRequest(carbon_values=[2, 4]), db=conn)
+    simulationId = create_response["simulationId"]
+    assert len(conn.statements) == 1
+
+    conn.statements.clear()
+    await advance_simulation(simulationId=simulationId, db=conn)
+
+    writes = [sql for sql in conn.statements if not sql.startswith("select")]
+    assert len(writes) == 1
+    assert [call["idx"] for call in conn.calls] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_simulation_current_value_is_one_round_trip(conn) -> None:
+    """Reading a value, counting down and auto-advancing all happen in a single statement."""
+    create_response = await create_simulation(SimulationCreateRequest(carbon_values=[(5, 1), (10, None)]), db=conn)
+    simulationId = create_response["simulationId"]
+
+    conn.statements.clear()
+    first = await get_simulation_carbon(simulationId=simulationId, db=conn)
+
+    assert first["carbon_intensity"] == 5.0
+    assert len(conn.statements) == 1
+    assert conn.sim_runs[simulationId]["current_index"] == 1
+    assert [call["carbon_intensity"] for call in conn.calls] == [5.0, 10.0]
+
+
+@pytest.mark.asyncio
+async def test_simulation_current_value_retries_on_version_conflict(conn) -> None:
+    """A countdown that lost its version check is re-read and applied exactly once."""
+    create_response = await create_simulation(SimulationCreateRequest(carbon_values=[(5, 3), (10, None)]), db=conn)
+    simulationId = create_response["simulationId"]
+
+    conn.conflicts = 2
+    first = await get_simulation_carbon(simulationId=simulationId, db=conn)
+
+    assert first["carbon_intensity"] == 5.0
+    assert conn.remaining(simulationId)[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_simulation_current_value_gives_up_after_repeated_conflicts(conn) -> None:
+    """A run that keeps changing returns a 409 instead of retrying forever."""
+    create_response = await create_simulation(SimulationCreateRequest(carbon_values=[(5, 3), (10, None)]), db=conn)
+    simulationId = create_response["simulationId"]
+
+    conn.conflicts = 100
+    with pytest.raises(HTTPException) as exc:
+        await get_simulation_carbon(simulationId=simulationId, db=conn)
+
+    assert exc.value.status_code == 409
+    assert conn.remaining(simulationId)[0] == 3
@@ -0,0 +1,146 @@
+"""Simulation store tests against a real PostgreSQL.
+
+`tests/test_simulation.py` drives the endpoints through a fake cursor, which has to mirror the countdown rules.
+These tests execute the actual statements instead. They need a scratch database and are skipped unless
+`ELEPHANT_TEST_DATABASE_URL` points at one; every test works in its own schema which is dropped afterwards.
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import psycopg
+import pytest
+
+from elephant.database import SIMULATION_DDL
+from elephant.simulation import SimulationNotFoundError, SimulationStore
+
+DATABASE_URL = os.getenv("ELEPHANT_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="ELEPHANT_TEST_DATABASE_URL is not set")
+
+FIXED_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _connect(schema: str) -> psycopg.Connection:
+    return psycopg.connect(DATABASE_URL, options=f"-c search_path={schema}")
+
+
+@pytest.fixture
+def schema():
+    """Name of a freshly created schema holding the simulation tables."""
+    name = f"elephant_test_{uuid.uuid4().hex}"
+    with psycopg.connect(DATABASE_URL, autocommit=True) as admin:
+        admin.execute(f"CREATE SCHEMA {name};")
+        with _connect(name) as conn:
+            conn.execute(SIMULATION_DDL)
+            conn.commit()
+        yield name
+        admin.execute(f"DROP SCHEMA {name} CASCADE;")
+
+
+@pytest.fixture
+def conn(schema):
+    """Connection whose search_path is the scratch schema."""
+    with _connect(schema) as connection:
+        yield connection
+
+
+@pytest.fixture
+def store():
+    return SimulationStore(time_provider=lambda: FIXED_TIME)
+
+
+def _state(conn, simulation_id):
+    """(current_index, version, {idx: remaining}, [(idx, carbon_intensity), ...]) of a run."""
+    run = conn.execute(
+        "SELECT current_index, version FROM simulation_runs WHERE simulation_id = %s;", (simulation_id,)
+    ).fetchone()
+    limits = dict(
+        conn.execute(
+            "SELECT idx, remaining FROM simulation_run_calls WHERE simulation_id = %s;", (simulation_id,)
+        ).fetchall()
+    )
+    calls = conn.execute(
+        "SELECT idx, carbon_intensity FROM simulation_calls WHERE simulation_id = %s ORDER BY id;", (simulation_id,)
+    ).fetchall()
+    conn.commit()
+    return run[0], run[1], limits, calls
+
+
+def test_create_stores_only_limited_values(conn, store) -> None:
+    """Values without a call limit get no simulation_run_calls row; the first value is recorded."""
+    simulation_id = store.create([(5, None), (10, 2), (15, 0)], conn=conn)
+
+    assert _state(conn, simulation_id) == (0, 0, {1: 2, 2: 0}, [(0, 5.0)])
+
+
+def test_current_value_counts_down_advances_and_parks(conn, store) -> None:
+    """The limit is decremented per read, moves on at zero and parks at -1 on the last value."""
+    simulation_id = store.create([(5, 2), (10, 1)], conn=conn)
+
+    assert store.current_value(simulation_id, conn=conn) == 5.0
+    assert _state(conn, simulation_id) == (0, 1, {0: 1, 1: 1}, [(0, 5.0)])
+
+    assert store.current_value(simulation_id, conn=conn) == 5.0
+    assert _state(conn, simulation_id) == (1, 2, {0: 0, 1: 1}, [(0, 5.0), (1, 10.0)])
+
+    assert store.current_value(simulation_id, conn=conn) == 10.0
+    assert _state(conn, simulation_id) == (1, 3, {0: 0, 1: -1}, [(0, 5.0), (1, 10.0)])
+
+    # Parked: further reads neither write nor report a conflict
+    assert store.current_value(simulation_id, conn=conn) == 10.0
+    assert _state(conn, simulation_id) == (1, 3, {0: 0, 1: -1}, [(0, 5.0), (1, 10.0)])
+
+
+def test_current_value_without_limit_does_not_write(conn, store) -> None:
+    """A value without a call limit is read without touching the run."""
+    simulation_id = store.create([5, 10], conn=conn)
+
+    for _ in range(3):
+        assert store.current_value(simulation_id, conn=conn) == 5.0
+
+    assert _state(conn, simulation_id) == (0, 0, {}, [(0, 5.0)])
+
+
+def test_current_value_retries_after_a_concurrent_write(schema, conn, store) -> None:
+    """A countdown whose version check loses against a concurrent writer is re-read and applied once."""
+    simulation_id = store.create([(5, 3), (10, None)], conn=conn)
+
+    with _connect(schema) as other:
+        # Hold the row with an uncommitted version bump so the countdown has to wait for it
+        other.execute("UPDATE simulation_runs SET version = version + 1 WHERE simulation_id = %s;", (simulation_id,))
+
+        results = []
+        with _connect(schema) as reader:
+            worker = threading.Thread(target=lambda: results.append(store.current_value(simulation_id, conn=reader)))
+            worker.start()
+            worker.join(timeout=0.5)
+            assert worker.is_alive()
+
+            other.commit()
+            worker.join(timeout=10)
+
+    assert results == [5.0]
+    assert _state(conn, simulation_id) == (0, 2, {0: 2}, [(0, 5.0)])
+
+
+def test_advance_stops_at_last_value(conn, store) -> None:
+    """advance moves one value per call, records it, and returns the last value once there."""
+    simulation_id = store.create([1, 2], conn=conn)
+
+    assert store.advance(simulation_id, conn=conn) == 2.0
+    assert store.advance(simulation_id, conn=conn) == 2.0
+    assert _state(conn, simulation_id) == (1, 1, {}, [(0, 1.0), (1, 2.0)])
+
+
+def test_unknown_simulation_raises_not_found(conn, store) -> None:
+    """Both hot paths report a missing run."""
+    missing = str(uuid.uuid4())
+
+    with pytest.raises(SimulationNotFoundError):
+        store.current_value(missing, conn=conn)
+
+    with pytest.raises(SimulationNotFoundError):
+        store.advance(missing, conn=conn)